@@ -1,11 +1,22 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
-from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import String, and_, cast, or_, func, insert, select, text, tuple_
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
+from cachetools import TTLCache
+from pydantic import BaseModel, ConfigDict
+import anyio
+import asyncio
+import csv
+import hashlib
+import heapq
+import io
+import json
+import time
 
-from app.db.base import get_db
+from app.db.base import get_async_db, AsyncSessionLocal
 from app.models.audit import AuditLog, AuditAction, AuditCategory
 from app.schemas.audit import (
     AuditLogCreate, AuditLogResponse,
@@ -17,39 +28,188 @@ from app.core.config import settings
 
 router = APIRouter()
 
+class AuditLogListItem(BaseModel):
+    """Short form of an audit log row used by the list endpoints"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    user_id: Optional[int] = None
+    username: str
+    action: AuditAction
+    category: AuditCategory
+    resource_type: Optional[str] = None
+    resource_id: Optional[str] = None
+    description: Optional[str] = None
+    created_at: datetime
+
+# Rows fetched per round-trip when streaming exports
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = (
+    "id", "created_at", "user_id", "username", "action", "category",
+    "resource_type", "resource_id", "description", "ip_address", "user_agent"
+)
+
+# Columns behind AuditLogListItem; metadata, ip_address and user_agent stay in the detail view
+LIST_COLUMNS = (
+    AuditLog.id, AuditLog.user_id, AuditLog.username, AuditLog.action,
+    AuditLog.category, AuditLog.resource_type, AuditLog.resource_id,
+    AuditLog.description, AuditLog.created_at
+)
+
+# Summaries are shared by every dashboard polling the same window
+SUMMARY_CACHE_TTL = 30
+_summary_cache: TTLCache = TTLCache(maxsize=128, ttl=SUMMARY_CACHE_TTL)
+# One lock per window, kept for the process lifetime; bounded by MAX_SUMMARY_DAYS
+MAX_SUMMARY_DAYS = 365
+_summary_locks: Dict[int, asyncio.Lock] = {}
+
+# Trigrams need at least three characters; shorter terms fall back to prefix matching
+MIN_SUBSTRING_SEARCH_LENGTH = 3
+
+# Enum columns are read as their stored labels (member names) and mapped here,
+# so the aggregate endpoints never build Enum members per row
+ACTION_VALUES = {member.name: member.value for member in AuditAction}
+CATEGORY_VALUES = {member.name: member.value for member in AuditCategory}
+# Reported for NULL or unrecognised labels
+UNKNOWN_LABEL = "Unknown"
+
+# Rows deleted per transaction by the cleanup endpoint
+CLEANUP_BATCH_SIZE = 5000
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "json": "application/json"
+}
+
+def _export_value(value):
+    """Convert a column value into something csv/json can write"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def _encode_csv_rows(rows) -> str:
+    """Encode one batch of export rows as CSV lines"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_export_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+def _encode_json_rows(rows) -> str:
+    """Encode one batch of export rows as comma-separated JSON objects"""
+    return ",".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, map(_export_value, row))))
+        for row in rows
+    )
+
+async def _stream_audit_export(statement, format: str):
+    """
+    Yield the export body batch by batch from a server-side cursor.
+    The generator owns its session so it stays open until the last row is sent;
+    each batch is encoded in a worker thread so large exports do not hold the loop.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        if format == "csv":
+            yield _encode_csv_rows([EXPORT_COLUMNS])
+            async for partition in result.partitions():
+                yield await anyio.to_thread.run_sync(_encode_csv_rows, partition)
+        else:
+            separator = ""
+            yield "["
+            async for partition in result.partitions():
+                yield separator + await anyio.to_thread.run_sync(_encode_json_rows, partition)
+                separator = ","
+            yield "]"
+
+async def _delete_audit_logs_before(db: AsyncSession, cutoff_date: datetime) -> int:
+    """
+    Delete audit logs older than the cutoff in short per-batch transactions
+    so row locks and WAL stay small while concurrent audit writes continue.
+    """
+    statement = text(
+        f"DELETE FROM {AuditLog.__tablename__} WHERE ctid IN ("
+        f"SELECT ctid FROM {AuditLog.__tablename__} WHERE created_at < :cutoff LIMIT :batch_size)"
+    )
+    deleted = 0
+    while True:
+        batch = (await db.execute(
+            statement,
+            {"cutoff": cutoff_date, "batch_size": CLEANUP_BATCH_SIZE}
+        )).rowcount
+        await db.commit()
+        deleted += batch
+        if batch < CLEANUP_BATCH_SIZE:
+            return deleted
+
+async def _fetch_page(
+    db: AsyncSession,
+    statement,
+    response: Response,
+    skip: int,
+    limit: int,
+    before_created_at: Optional[datetime],
+    before_id: Optional[int]
+):
+    """
+    Run a list query newest first. With a cursor the page starts with an index
+    seek on (created_at, id) instead of scanning and discarding `skip` rows;
+    the cursor for the following page is returned in the X-Next-* headers.
+    """
+    if before_created_at is not None and before_id is not None:
+        statement = statement.where(
+            tuple_(AuditLog.created_at, AuditLog.id) < tuple_(before_created_at, before_id)
+        )
+    elif skip:
+        statement = statement.offset(skip)
+    
+    rows = (await db.execute(
+        statement.order_by(AuditLog.created_at.desc(), AuditLog.id.desc()).limit(limit)
+    )).all()
+    
+    if len(rows) == limit:
+        response.headers["X-Next-Before-Created-At"] = rows[-1].created_at.isoformat()
+        response.headers["X-Next-Before-Id"] = str(rows[-1].id)
+    
+    return rows
+
 @router.post("/audit/log", response_model=AuditLogResponse)
 async def create_audit_log(
     audit_data: AuditLogCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create an audit log entry
     """
-    audit_log = AuditLog(
-        user_id=current_user.id,
-        username=current_user.username,
-        action=audit_data.action,
-        category=audit_data.category,
-        resource_type=audit_data.resource_type,
-        resource_id=audit_data.resource_id,
-        description=audit_data.description,
-        ip_address=audit_data.ip_address,
-        user_agent=audit_data.user_agent,
-        metadata=audit_data.metadata,
-        created_at=datetime.now()
-    )
-    
-    db.add(audit_log)
-    db.commit()
-    db.refresh(audit_log)
+    # INSERT ... RETURNING hands back the stored row in the same round-trip
+    audit_log = (await db.execute(
+        insert(AuditLog).values(
+            user_id=current_user.id,
+            username=current_user.username,
+            action=audit_data.action,
+            category=audit_data.category,
+            resource_type=audit_data.resource_type,
+            resource_id=audit_data.resource_id,
+            description=audit_data.description,
+            ip_address=audit_data.ip_address,
+            user_agent=audit_data.user_agent,
+            metadata=audit_data.metadata,
+            created_at=func.now()
+        ).returning(AuditLog)
+    )).scalar_one()
+    await db.commit()
     
     return audit_log
 
-@router.get("/audit/logs", response_model=List[AuditLogResponse])
+@router.get("/audit/logs", response_model=List[AuditLogListItem], response_class=ORJSONResponse)
 async def get_audit_logs(
+    response: Response,
     skip: int = 0,
     limit: int = Query(100, le=1000),
+    before_created_at: Optional[datetime] = None,
+    before_id: Optional[int] = None,
     user_id: Optional[int] = None,
     action: Optional[AuditAction] = None,
     category: Optional[AuditCategory] = None,
@@ -57,32 +217,47 @@ async def get_audit_logs(
     resource_id: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    search: Optional[str] = None,
+    search: Optional[str] = Query(
+        None,
+        description=(
+            f"Substring match on description, username and resource id. Terms shorter "
+            f"than {MIN_SUBSTRING_SEARCH_LENGTH} characters only prefix-match username and resource id."
+        )
+    ),
     current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.COMPLIANCE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get audit logs with filtering options
     """
-    query = db.query(AuditLog)
+    statement = select(*LIST_COLUMNS)
     
     # Apply filters
     if user_id:
-        query = query.filter(AuditLog.user_id == user_id)
+        statement = statement.where(AuditLog.user_id == user_id)
     if action:
-        query = query.filter(AuditLog.action == action)
+        statement = statement.where(AuditLog.action == action)
     if category:
-        query = query.filter(AuditLog.category == category)
+        statement = statement.where(AuditLog.category == category)
     if resource_type:
-        query = query.filter(AuditLog.resource_type == resource_type)
+        statement = statement.where(AuditLog.resource_type == resource_type)
     if resource_id:
-        query = query.filter(AuditLog.resource_id == resource_id)
+        statement = statement.where(AuditLog.resource_id == resource_id)
     if start_date:
-        query = query.filter(AuditLog.created_at >= start_date)
+        statement = statement.where(AuditLog.created_at >= start_date)
     if end_date:
-        query = query.filter(AuditLog.created_at <= end_date)
-    if search:
-        query = query.filter(
+        statement = statement.where(AuditLog.created_at <= end_date)
+    if search and len(search) < MIN_SUBSTRING_SEARCH_LENGTH:
+        # LIKE 'x%' can use the text_pattern_ops B-tree indexes
+        statement = statement.where(
+            or_(
+                AuditLog.username.startswith(search),
+                AuditLog.resource_id.startswith(search)
+            )
+        )
+    elif search:
+        # LIKE '%search%' is served by the audit_search_trgm_idx GIN index
+        statement = statement.where(
             or_(
                 AuditLog.description.contains(search),
                 AuditLog.username.contains(search),
@@ -90,21 +265,18 @@ async def get_audit_logs(
             )
         )
     
-    # Order by most recent first
-    query = query.order_by(AuditLog.created_at.desc())
-    
-    return query.offset(skip).limit(limit).all()
+    return await _fetch_page(db, statement, response, skip, limit, before_created_at, before_id)
 
 @router.get("/audit/logs/{log_id}", response_model=AuditLogResponse)
 async def get_audit_log(
     log_id: int,
     current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.COMPLIANCE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a specific audit log entry
     """
-    audit_log = db.query(AuditLog).filter(AuditLog.id == log_id).first()
+    audit_log = await db.get(AuditLog, log_id)
     
     if not audit_log:
         raise HTTPException(
@@ -114,55 +286,45 @@ async def get_audit_log(
     
     return audit_log
 
-@router.get("/audit/summary", response_model=AuditSummary)
-async def get_audit_summary(
-    days: int = Query(30, description="Number of days to look back"),
-    current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.COMPLIANCE])),
-    db: Session = Depends(get_db)
-):
-    """
-    Get audit summary statistics
-    """
+async def _build_audit_summary(db: AsyncSession, days: int) -> Dict[str, Any]:
+    """Aggregate the audit summary for the last `days` days"""
     start_date = datetime.now() - timedelta(days=days)
+    day = func.date(AuditLog.created_at)
+    action = cast(AuditLog.action, String)
+    category = cast(AuditLog.category, String)
     
-    # Total logs
-    total_logs = db.query(func.count(AuditLog.id)).filter(
-        AuditLog.created_at >= start_date
-    ).scalar()
-    
-    # Logs by action
-    logs_by_action = db.query(
-        AuditLog.action,
-        func.count(AuditLog.id).label('count')
-    ).filter(
-        AuditLog.created_at >= start_date
-    ).group_by(AuditLog.action).all()
-    
-    # Logs by category
-    logs_by_category = db.query(
-        AuditLog.category,
-        func.count(AuditLog.id).label('count')
-    ).filter(
-        AuditLog.created_at >= start_date
-    ).group_by(AuditLog.category).all()
-    
-    # Most active users
-    most_active_users = db.query(
+    # One pass over the window; GROUPING() tells which set each row belongs to
+    rows = (await db.execute(select(
+        action,
+        category,
         AuditLog.username,
-        func.count(AuditLog.id).label('action_count')
-    ).filter(
+        day.label('date'),
+        func.count(AuditLog.id).label('count'),
+        func.grouping(action).label('by_action'),
+        func.grouping(category).label('by_category'),
+        func.grouping(AuditLog.username).label('by_user'),
+    ).where(
         AuditLog.created_at >= start_date
-    ).group_by(AuditLog.username).order_by(
-        func.count(AuditLog.id).desc()
-    ).limit(10).all()
+    ).group_by(
+        func.grouping_sets(action, category, AuditLog.username, day)
+    ))).all()
     
-    # Daily activity
-    daily_activity = db.query(
-        func.date(AuditLog.created_at).label('date'),
-        func.count(AuditLog.id).label('count')
-    ).filter(
-        AuditLog.created_at >= start_date
-    ).group_by('date').all()
+    logs_by_action = []
+    logs_by_category = []
+    user_counts = []
+    daily_activity = []
+    for action, category, username, date, count, by_action, by_category, by_user in rows:
+        if by_action == 0:
+            logs_by_action.append((action, count))
+        elif by_category == 0:
+            logs_by_category.append((category, count))
+        elif by_user == 0:
+            user_counts.append((username, count))
+        else:
+            daily_activity.append((date, count))
+    
+    most_active_users = heapq.nlargest(10, user_counts, key=lambda item: item[1])
+    daily_activity.sort(key=lambda item: item[0])
     
     return {
         "period": {
@@ -170,13 +332,13 @@ async def get_audit_summary(
             "end": datetime.now(),
             "days": days
         },
-        "total_logs": total_logs or 0,
+        "total_logs": sum(count for _, count in logs_by_action),
         "logs_by_action": [
-            {"action": action.value if action else "Unknown", "count": count}
+            {"action": ACTION_VALUES.get(action, UNKNOWN_LABEL), "count": count}
             for action, count in logs_by_action
         ],
         "logs_by_category": [
-            {"category": category.value if category else "Unknown", "count": count}
+            {"category": CATEGORY_VALUES.get(category, UNKNOWN_LABEL), "count": count}
             for category, count in logs_by_category
         ],
         "most_active_users": [
@@ -189,103 +351,144 @@ async def get_audit_summary(
         ]
     }
 
-@router.get("/audit/user/{user_id}", response_model=List[AuditLogResponse])
+async def _get_cached_audit_summary(db: AsyncSession, days: int) -> Tuple[str, Dict[str, Any]]:
+    """
+    Return (etag, summary) for the window, building it at most once per TTL;
+    concurrent misses for the same window wait on one lock instead of all
+    running the aggregation.
+    """
+    cached = _summary_cache.get(days)
+    if cached is not None:
+        return cached
+    
+    lock = _summary_locks.setdefault(days, asyncio.Lock())
+    async with lock:
+        cached = _summary_cache.get(days)
+        if cached is None:
+            summary = await _build_audit_summary(db, days)
+            key = f"summary:{days}:{int(time.time() // SUMMARY_CACHE_TTL)}"
+            cached = (f'"{hashlib.sha1(key.encode()).hexdigest()}"', summary)
+            _summary_cache[days] = cached
+    
+    return cached
+
+@router.get("/audit/summary", response_model=AuditSummary, response_class=ORJSONResponse)
+async def get_audit_summary(
+    request: Request,
+    response: Response,
+    days: int = Query(30, ge=1, le=MAX_SUMMARY_DAYS, description="Number of days to look back"),
+    current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.COMPLIANCE])),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get audit summary statistics
+    """
+    etag, summary = await _get_cached_audit_summary(db, days)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"max-age={SUMMARY_CACHE_TTL}, private"
+    }
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response.headers.update(headers)
+    return summary
+
+@router.get("/audit/user/{user_id}", response_model=List[AuditLogListItem], response_class=ORJSONResponse)
 async def get_user_audit_logs(
     user_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = Query(100, le=1000),
+    before_created_at: Optional[datetime] = None,
+    before_id: Optional[int] = None,
     current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.COMPLIANCE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all audit logs for a specific user
     """
-    logs = db.query(AuditLog).filter(
-        AuditLog.user_id == user_id
-    ).order_by(
-        AuditLog.created_at.desc()
-    ).offset(skip).limit(limit).all()
+    statement = select(*LIST_COLUMNS).where(AuditLog.user_id == user_id)
     
-    return logs
+    return await _fetch_page(db, statement, response, skip, limit, before_created_at, before_id)
 
-@router.get("/audit/resource/{resource_type}/{resource_id}", response_model=List[AuditLogResponse])
+@router.get("/audit/resource/{resource_type}/{resource_id}", response_model=List[AuditLogListItem], response_class=ORJSONResponse)
 async def get_resource_audit_logs(
     resource_type: str,
     resource_id: str,
+    response: Response,
     skip: int = 0,
     limit: int = Query(100, le=1000),
+    before_created_at: Optional[datetime] = None,
+    before_id: Optional[int] = None,
     current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.COMPLIANCE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all audit logs for a specific resource
     """
-    logs = db.query(AuditLog).filter(
+    statement = select(*LIST_COLUMNS).where(
         AuditLog.resource_type == resource_type,
         AuditLog.resource_id == resource_id
-    ).order_by(
-        AuditLog.created_at.desc()
-    ).offset(skip).limit(limit).all()
+    )
     
-    return logs
+    return await _fetch_page(db, statement, response, skip, limit, before_created_at, before_id)
 
 @router.post("/audit/export")
 async def export_audit_logs(
     filter: AuditFilter,
-    format: str = Query("csv", description="Export format: csv, json, excel"),
-    current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.COMPLIANCE])),
-    db: Session = Depends(get_db)
+    format: str = Query("csv", description="Export format: csv, json"),
+    current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.COMPLIANCE]))
 ):
     """
-    Export audit logs based on filters
+    Export audit logs based on filters, streamed as they are read
     """
-    query = db.query(AuditLog)
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format: {format}"
+        )
+    
+    statement = select(*(getattr(AuditLog, column) for column in EXPORT_COLUMNS))
     
     # Apply filters from AuditFilter
     if filter.start_date:
-        query = query.filter(AuditLog.created_at >= filter.start_date)
+        statement = statement.where(AuditLog.created_at >= filter.start_date)
     if filter.end_date:
-        query = query.filter(AuditLog.created_at <= filter.end_date)
+        statement = statement.where(AuditLog.created_at <= filter.end_date)
     if filter.user_ids:
-        query = query.filter(AuditLog.user_id.in_(filter.user_ids))
+        statement = statement.where(AuditLog.user_id.in_(filter.user_ids))
     if filter.actions:
-        query = query.filter(AuditLog.action.in_(filter.actions))
+        statement = statement.where(AuditLog.action.in_(filter.actions))
     if filter.categories:
-        query = query.filter(AuditLog.category.in_(filter.categories))
+        statement = statement.where(AuditLog.category.in_(filter.categories))
     
-    logs = query.all()
+    statement = statement.order_by(AuditLog.created_at)
+    filename = f"audit_logs_{datetime.now().strftime('%Y%m%d%H%M%S')}.{format}"
     
-    # In production, convert logs to requested format and return file
-    return {
-        "message": f"Exporting {len(logs)} audit logs",
-        "format": format,
-        "download_url": f"/api/v1/audit/download/audit_logs_{datetime.now().timestamp()}.{format}"
-    }
+    return StreamingResponse(
+        _stream_audit_export(statement, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 @router.delete("/audit/cleanup")
 async def cleanup_old_audit_logs(
     days: int = Query(365, description="Delete logs older than this many days"),
     current_user: User = Depends(require_role([UserRole.ADMIN])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Clean up old audit logs (admin only)
     """
     cutoff_date = datetime.now() - timedelta(days=days)
     
-    # Count logs to be deleted
-    count = db.query(func.count(AuditLog.id)).filter(
-        AuditLog.created_at < cutoff_date
-    ).scalar()
-    
-    # Delete old logs
-    db.query(AuditLog).filter(
-        AuditLog.created_at < cutoff_date
-    ).delete()
-    db.commit()
+    # Delete old logs in batches; the rowcounts give the total
+    count = await _delete_audit_logs_before(db, cutoff_date)
     
     # Create audit log for this action
-    cleanup_log = AuditLog(
+    await db.execute(insert(AuditLog).values(
         user_id=current_user.id,
         username=current_user.username,
         action=AuditAction.DELETE,
@@ -293,73 +496,75 @@ async def cleanup_old_audit_logs(
         resource_type="audit_logs",
         resource_id="cleanup",
         description=f"Cleaned up {count} audit logs older than {days} days",
-        created_at=datetime.now()
-    )
-    db.add(cleanup_log)
-    db.commit()
+        created_at=func.now()
+    ))
+    await db.commit()
     
     return {
         "message": f"Deleted {count} audit logs older than {days} days",
         "cutoff_date": cutoff_date
     }
 
-@router.get("/audit/compliance/report")
+@router.get("/audit/compliance/report", response_class=ORJSONResponse)
 async def get_compliance_audit_report(
     start_date: datetime,
     end_date: datetime,
     current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.COMPLIANCE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Generate compliance audit report
     """
-    # Get all compliance-related actions
-    compliance_logs = db.query(AuditLog).filter(
-        and_(
-            AuditLog.created_at >= start_date,
-            AuditLog.created_at <= end_date,
-            AuditLog.category == AuditCategory.COMPLIANCE
-        )
-    ).all()
+    in_period = and_(
+        AuditLog.created_at >= start_date,
+        AuditLog.created_at <= end_date
+    )
     
-    # Get suspicious transaction reviews
-    transaction_reviews = db.query(AuditLog).filter(
-        and_(
-            AuditLog.created_at >= start_date,
-            AuditLog.created_at <= end_date,
-            AuditLog.resource_type == "suspicious_case",
-            AuditLog.action.in_([AuditAction.VIEW, AuditAction.UPDATE])
+    # Compliance actions, suspicious transaction reviews and report generations in one scan
+    compliance_actions, transaction_reviews, report_generations = (await db.execute(select(
+        func.count(AuditLog.id).filter(
+            AuditLog.category == AuditCategory.COMPLIANCE
+        ),
+        func.count(AuditLog.id).filter(
+            and_(
+                AuditLog.resource_type == "suspicious_case",
+                AuditLog.action.in_([AuditAction.VIEW, AuditAction.UPDATE])
+            )
+        ),
+        func.count(AuditLog.id).filter(
+            and_(
+                AuditLog.resource_type == "report",
+                AuditLog.action == AuditAction.CREATE
+            )
         )
-    ).count()
+    ).where(in_period))).one()
     
-    # Get report generations
-    report_generations = db.query(AuditLog).filter(
-        and_(
-            AuditLog.created_at >= start_date,
-            AuditLog.created_at <= end_date,
-            AuditLog.resource_type == "report",
-            AuditLog.action == AuditAction.CREATE
-        )
-    ).count()
+    # Last 20 compliance activities, only the columns that are returned
+    key_activities = (await db.execute(select(
+        AuditLog.created_at,
+        AuditLog.username,
+        cast(AuditLog.action, String),
+        AuditLog.description
+    ).where(
+        in_period,
+        AuditLog.category == AuditCategory.COMPLIANCE
+    ).order_by(AuditLog.created_at.desc()).limit(20))).all()
     
     # Get user access patterns
-    user_access = db.query(
+    user_access = (await db.execute(select(
         AuditLog.username,
         func.count(AuditLog.id).label('access_count')
-    ).filter(
-        and_(
-            AuditLog.created_at >= start_date,
-            AuditLog.created_at <= end_date,
-            AuditLog.action == AuditAction.LOGIN
-        )
-    ).group_by(AuditLog.username).all()
+    ).where(
+        in_period,
+        AuditLog.action == AuditAction.LOGIN
+    ).group_by(AuditLog.username))).all()
     
     return {
         "report_period": {
             "start": start_date,
             "end": end_date
         },
-        "compliance_actions": len(compliance_logs),
+        "compliance_actions": compliance_actions,
         "transaction_reviews": transaction_reviews,
         "reports_generated": report_generations,
         "user_access_summary": [
@@ -368,11 +573,11 @@ async def get_compliance_audit_report(
         ],
         "key_activities": [
             {
-                "timestamp": log.created_at,
-                "user": log.username,
-                "action": log.action.value,
-                "description": log.description
+                "timestamp": created_at,
+                "user": username,
+                "action": ACTION_VALUES.get(action, UNKNOWN_LABEL),
+                "description": description
             }
-            for log in compliance_logs[:20]  # Last 20 compliance activities
+            for created_at, username, action, description in key_activities
         ]
-    }
\ No newline at end of file
+    }
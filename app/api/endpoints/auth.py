@@ -1,18 +1,39 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
+from cachetools import TTLCache
+import hashlib
+import time
 
-from app.db.base import get_db
-from app.models.user import User, AuditTrail
-from app.core.security import verify_password, get_password_hash, create_access_token, verify_token
+from app.db.base import get_async_db
+from app.models.user import User, UserRole
+from app.core.security import (
+    verify_password, get_password_hash, create_access_token, decode_token, DUMMY_PASSWORD_HASH
+)
 from app.core.config import settings
+from app.services.audit_writer import audit_writer
 from pydantic import BaseModel, EmailStr
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# (detached User, token exp) keyed by token hash; a hit skips the JWT decode
+# as well as the lookup. Only touched from the event loop.
+_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+def invalidate_cached_user(user_id: int):
+    """Drop every cached token entry for a user"""
+    for key, (cached_user, _) in list(_user_cache.items()):
+        if cached_user.id == user_id:
+            _user_cache.pop(key, None)
+
 # Pydantic models for request/response
 class UserCreate(BaseModel):
     name: str
@@ -38,7 +59,7 @@ class UserResponse(BaseModel):
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """Get current authenticated user"""
     credentials_exception = HTTPException(
@@ -47,24 +68,51 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    email = verify_token(token)
-    if email is None:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise credentials_exception
-    
-    return user
+    key = _token_cache_key(token)
+    entry = _user_cache.get(key)
+    # The same token always decodes the same way; only its expiry can change
+    if entry is not None and entry[1] > time.time():
+        cached_user = entry[0]
+    else:
+        payload = decode_token(token)
+        if payload is None or payload.get("sub") is None:
+            raise credentials_exception
+        
+        cached_user = (await db.execute(
+            select(User).where(User.email == payload["sub"])
+        )).scalar_one_or_none()
+        if cached_user is None:
+            raise credentials_exception
+        db.expunge(cached_user)
+        _user_cache[key] = (cached_user, payload["exp"])
+    
+    # Attach a copy to this session without emitting a SELECT
+    return await db.merge(cached_user, load=False)
+
+def require_role(roles: List[UserRole]):
+    """Dependency admitting only authenticated users holding one of roles"""
+    allowed = {role.value for role in roles}
+    
+    async def check_role(current_user: User = Depends(get_current_user)) -> User:
+        if current_user.role not in allowed:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient permissions"
+            )
+        return current_user
+    
+    return check_role
 
 @router.post("/auth/register", response_model=UserResponse)
 async def register(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Register a new user"""
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = (await db.execute(
+        select(User.id).where(User.email == user_data.email)
+    )).first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -72,7 +120,7 @@ async def register(
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await run_in_threadpool(get_password_hash, user_data.password)
     new_user = User(
         name=user_data.name,
         email=user_data.email,
@@ -80,31 +128,37 @@ async def register(
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     # Log the registration
-    audit = AuditTrail(
+    audit_writer.enqueue(
         user_id=new_user.id,
         module="Authentication",
         activity=f"User registered: {new_user.email}",
         ip_address="127.0.0.1"  # In production, get actual IP
     )
-    db.add(audit)
-    db.commit()
     
     return new_user
 
 @router.post("/auth/login", response_model=Token)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Login and receive access token"""
     # Find user by email (username field contains email)
-    user = db.query(User).filter(User.email == form_data.username).first()
-    
-    if not user or not verify_password(form_data.password, user.password):
+    user = (await db.execute(
+        select(User).where(User.email == form_data.username)
+    )).scalar_one_or_none()
+    
+    # The KDF runs in the threadpool, and against a dummy hash for unknown users
+    password_ok = await run_in_threadpool(
+        verify_password,
+        form_data.password,
+        user.password if user else DUMMY_PASSWORD_HASH
+    )
+    if not user or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -119,14 +173,12 @@ async def login(
     )
     
     # Log the login
-    audit = AuditTrail(
+    audit_writer.enqueue(
         user_id=user.id,
         module="Authentication",
         activity=f"User logged in: {user.email}",
         ip_address="127.0.0.1"  # In production, get actual IP
     )
-    db.add(audit)
-    db.commit()
     
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -136,20 +188,17 @@ async def get_me(current_user: User = Depends(get_current_user)):
     return current_user
 
 @router.post("/auth/logout")
-async def logout(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+async def logout(current_user: User = Depends(get_current_user)):
     """Logout the current user"""
+    invalidate_cached_user(current_user.id)
+    
     # Log the logout
-    audit = AuditTrail(
+    audit_writer.enqueue(
         user_id=current_user.id,
         module="Authentication",
         activity=f"User logged out: {current_user.email}",
         ip_address="127.0.0.1"
     )
-    db.add(audit)
-    db.commit()
     
     return {"message": "Successfully logged out"}
 
@@ -158,29 +207,28 @@ async def change_password(
     old_password: str,
     new_password: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Change user password"""
     # Verify old password
-    if not verify_password(old_password, current_user.password):
+    if not await run_in_threadpool(verify_password, old_password, current_user.password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect old password"
         )
     
     # Update password
-    current_user.password = get_password_hash(new_password)
-    current_user.password_expiry = datetime.now() + timedelta(days=90)  # 90 days expiry
-    db.commit()
+    current_user.password = await run_in_threadpool(get_password_hash, new_password)
+    current_user.password_expiry = func.now() + timedelta(days=90)  # 90 days expiry, DB clock
+    await db.commit()
+    invalidate_cached_user(current_user.id)
     
     # Log the password change
-    audit = AuditTrail(
+    audit_writer.enqueue(
         user_id=current_user.id,
         module="Authentication",
         activity=f"Password changed for: {current_user.email}",
         ip_address="127.0.0.1"
     )
-    db.add(audit)
-    db.commit()
     
     return {"message": "Password changed successfully"}
\ No newline at end of file
@@ -1,14 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy import Float, Numeric, func, and_, or_, case, cast, select, text
 from typing import List, Optional, Dict, Any
+from pydantic import BaseModel
 from datetime import datetime, timedelta, date
+import asyncio
 from io import BytesIO
-import json
+import hashlib
+import orjson
 
-from app.db.base import get_db
+from app.db.base import get_db, run_isolated
 from app.models.transaction import (
-    SuspiciousCase, CustomerProfile, Transaction,
+    SuspiciousCase, SuspiciousCaseDailyRollup, CustomerProfile, Transaction,
     Watchlist, TransactionExemption, TransactionStatus
 )
 from app.schemas.reports import (
@@ -17,53 +22,116 @@ from app.schemas.reports import (
     ActivitySummary, ReportFormat
 )
 from app.core.config import settings
+from app.core import cache
+from app.core.request_time import get_request_time
 from app.services.report_generator import ReportGeneratorService
 
-router = APIRouter()
+# Report payloads are large nested dicts; encode them with orjson
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Fixed-shape responses are serialized by pydantic-core instead of jsonable_encoder
+class ComplianceSummary(BaseModel):
+    total_transactions_monitored: int
+    suspicious_cases_identified: int
+    high_risk_cases: int
+    strs_filed: int
+    compliance_rate: float
+
+class RiskCategoryCount(BaseModel):
+    category: Optional[str] = None
+    count: int
+
+class WatchlistStats(BaseModel):
+    total_watchlisted: int
+    added_this_month: int
+
+class ExemptionStats(BaseModel):
+    active_exemptions: int
+
+class MonthlyComplianceResponse(BaseModel):
+    report_period: str
+    generated_at: datetime
+    summary: ComplianceSummary
+    risk_categories: List[RiskCategoryCount]
+    watchlist_stats: WatchlistStats
+    exemptions_stats: ExemptionStats
+
+# Rollup rows store the status label (member name)
+STATUS_VALUES = {member.name: member.value for member in TransactionStatus}
+
+# Closed months never change; open windows are refreshed every minute
+HISTORICAL_REPORT_TTL = 30 * 24 * 3600
+LATEST_REPORT_TTL = 60
+
+# Identical generate requests within this window share one computation
+GENERATED_REPORT_TTL = 300
+
+def _risk_indicators(value) -> List[Any]:
+    """
+    Decode stored risk indicators; JSON/JSONB columns arrive already decoded,
+    legacy text columns are parsed with orjson
+    """
+    if not value:
+        return []
+    if isinstance(value, (str, bytes)):
+        return orjson.loads(value)
+    return value
+
+def _generate_report_data(db: Session, request: ReportRequest) -> Dict[str, Any]:
+    """Run the report generator for one request"""
+    report_service = ReportGeneratorService(db)
+    
+    if request.report_type == ReportType.STR:
+        report_data = report_service.generate_str_report(
+            request.case_numbers,
+            request.start_date,
+            request.end_date
+        )
+    elif request.report_type == ReportType.COMPLIANCE:
+        report_data = report_service.generate_compliance_report(
+            request.start_date,
+            request.end_date
+        )
+    elif request.report_type == ReportType.RISK:
+        report_data = report_service.generate_risk_report(
+            request.start_date,
+            request.end_date,
+            request.risk_threshold
+        )
+    elif request.report_type == ReportType.ACTIVITY:
+        report_data = report_service.generate_activity_report(
+            request.start_date,
+            request.end_date
+        )
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid report type"
+        )
+    
+    return report_data
 
 @router.post("/reports/generate", response_model=ReportResponse)
 async def generate_report(
     request: ReportRequest,
+    now: datetime = Depends(get_request_time),
     db: Session = Depends(get_db)
 ):
     """
     Generate a compliance report based on type and parameters
     """
-    report_service = ReportGeneratorService(db)
+    key = f"rpt:generate:{hashlib.sha1(request.model_dump_json().encode()).hexdigest()}"
     
     try:
-        if request.report_type == ReportType.STR:
-            report_data = report_service.generate_str_report(
-                request.case_numbers,
-                request.start_date,
-                request.end_date
-            )
-        elif request.report_type == ReportType.COMPLIANCE:
-            report_data = report_service.generate_compliance_report(
-                request.start_date,
-                request.end_date
-            )
-        elif request.report_type == ReportType.RISK:
-            report_data = report_service.generate_risk_report(
-                request.start_date,
-                request.end_date,
-                request.risk_threshold
-            )
-        elif request.report_type == ReportType.ACTIVITY:
-            report_data = report_service.generate_activity_report(
-                request.start_date,
-                request.end_date
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid report type"
-            )
+        report_data = await cache.get_or_set(
+            key, GENERATED_REPORT_TTL,
+            lambda: run_in_threadpool(_generate_report_data, db, request)
+        )
         
         return ReportResponse(
             report_id=report_data.get('report_id'),
             report_type=request.report_type,
-            generated_at=datetime.now(),
+            generated_at=now,
             file_url=report_data.get('file_url'),
             data=report_data.get('data')
         )
@@ -76,34 +144,34 @@ async def generate_report(
 @router.get("/reports/str/{case_number}")
 async def get_str_report(
     case_number: str,
+    now: datetime = Depends(get_request_time),
     db: Session = Depends(get_db)
 ):
     """
     Get Suspicious Transaction Report for a specific case
     """
-    case = db.query(SuspiciousCase).filter(
-        SuspiciousCase.case_number == case_number
+    # Case and customer id in one round-trip
+    row = db.execute(
+        select(SuspiciousCase, CustomerProfile.id.label('customer_id')).outerjoin(
+            CustomerProfile, CustomerProfile.acct_no == SuspiciousCase.account_number
+        ).where(SuspiciousCase.case_number == case_number)
     ).first()
     
-    if not case:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Case not found"
         )
-    
-    # Get customer profile
-    profile = db.query(CustomerProfile).filter(
-        CustomerProfile.acct_no == case.account_number
-    ).first()
+    case, customer_id = row
     
     return {
         "case_number": case.case_number,
-        "filing_date": datetime.now(),
+        "filing_date": now,
         "reporting_entity": settings.ORGANIZATION_NAME,
         "subject_information": {
             "account_number": case.account_number,
             "account_name": case.account_name,
-            "customer_id": profile.id if profile else None,
+            "customer_id": customer_id,
             "risk_score": case.risk_score
         },
         "transaction_details": {
@@ -116,18 +184,18 @@ async def get_str_report(
         "suspicious_activity": {
             "category": case.compliance_category,
             "description": case.flagging_reason,
-            "risk_indicators": json.loads(case.risk_indicators) if case.risk_indicators else []
+            "risk_indicators": _risk_indicators(case.risk_indicators)
         },
         "action_taken": case.status,
         "law_enforcement_contacted": False,
         "narrative": f"Suspicious transaction detected for account {case.account_number}. {case.flagging_reason}"
     }
 
-@router.get("/reports/compliance/monthly")
+@router.get("/reports/compliance/monthly", response_model=MonthlyComplianceResponse)
 async def get_monthly_compliance_report(
     year: int = Query(..., description="Year"),
     month: int = Query(..., ge=1, le=12, description="Month"),
-    db: Session = Depends(get_db)
+    now: datetime = Depends(get_request_time)
 ):
     """
     Get monthly compliance report with statistics
@@ -138,78 +206,98 @@ async def get_monthly_compliance_report(
     else:
         end_date = datetime(year, month + 1, 1) - timedelta(seconds=1)
     
-    # Get statistics
-    total_transactions = db.query(func.count(Transaction.id)).filter(
-        and_(
-            Transaction.created_at >= start_date,
-            Transaction.created_at <= end_date
-        )
-    ).scalar()
+    if end_date < now:
+        key, ttl = f"rpt:compliance:historical:{year}:{month:02d}", HISTORICAL_REPORT_TTL
+    else:
+        key, ttl = f"rpt:compliance:latest:{year}:{month:02d}", LATEST_REPORT_TTL
     
-    suspicious_cases = db.query(func.count(SuspiciousCase.id)).filter(
-        and_(
-            SuspiciousCase.created_at >= start_date,
-            SuspiciousCase.created_at <= end_date
-        )
-    ).scalar()
+    return await cache.get_or_set(
+        key, ttl,
+        lambda: _build_monthly_compliance_report(year, month, start_date, end_date, now)
+    )
+
+def _compliance_rate_statement(start_date: datetime, end_date: datetime):
+    """
+    Transactions in the window and the compliance rate
+    ROUND(100 * (1 - suspicious / NULLIF(total, 0)), 2), 100 when there were none
+    """
+    total = select(func.count()).select_from(Transaction).where(
+        Transaction.created_at.between(start_date, end_date)
+    ).scalar_subquery()
+    suspicious = select(func.count()).select_from(SuspiciousCase).where(
+        SuspiciousCase.created_at.between(start_date, end_date)
+    ).scalar_subquery()
     
-    high_risk_cases = db.query(func.count(SuspiciousCase.id)).filter(
-        and_(
-            SuspiciousCase.created_at >= start_date,
-            SuspiciousCase.created_at <= end_date,
-            SuspiciousCase.risk_score >= 70
+    rate = func.round(100 * (1 - cast(suspicious, Numeric) / func.nullif(total, 0)), 2)
+    return select(total, cast(func.coalesce(rate, 100), Float))
+
+async def _build_monthly_compliance_report(
+    year: int,
+    month: int,
+    start_date: datetime,
+    end_date: datetime,
+    now: datetime
+) -> Dict[str, Any]:
+    """Aggregate the monthly compliance report for one calendar month"""
+    # The four aggregates are independent; run them concurrently on separate connections
+    transaction_counts, risk_categories, watchlist_counts, active_exemptions = await asyncio.gather(
+        run_isolated(_compliance_rate_statement(start_date, end_date), "one"),
+        # Per-category totals, high-risk and STR counts in one scan of the window
+        run_isolated(
+            select(
+                SuspiciousCase.compliance_category,
+                func.count().label('count'),
+                func.count().filter(SuspiciousCase.risk_score >= 70).label('high_risk'),
+                func.count().filter(
+                    SuspiciousCase.status == TransactionStatus.NOT_COMPLIANT
+                ).label('strs_filed')
+            ).where(
+                SuspiciousCase.created_at.between(start_date, end_date)
+            ).group_by(SuspiciousCase.compliance_category)
+        ),
+        run_isolated(
+            select(
+                func.count().filter(Watchlist.is_active == True),
+                func.count().filter(Watchlist.created_at.between(start_date, end_date))
+            ).select_from(Watchlist),
+            "one"
+        ),
+        run_isolated(
+            select(func.count()).select_from(TransactionExemption).where(
+                TransactionExemption.is_active == True
+            ),
+            "scalar"
         )
-    ).scalar()
+    )
+    total_transactions, compliance_rate = transaction_counts
+    total_watchlisted, watchlisted_this_month = watchlist_counts
     
-    # STRs filed
-    strs_filed = db.query(func.count(SuspiciousCase.id)).filter(
-        and_(
-            SuspiciousCase.created_at >= start_date,
-            SuspiciousCase.created_at <= end_date,
-            SuspiciousCase.status == TransactionStatus.REPORTED
-        )
-    ).scalar()
-    
-    # Get top risk categories
-    risk_categories = db.query(
-        SuspiciousCase.compliance_category,
-        func.count(SuspiciousCase.id).label('count')
-    ).filter(
-        and_(
-            SuspiciousCase.created_at >= start_date,
-            SuspiciousCase.created_at <= end_date
-        )
-    ).group_by(SuspiciousCase.compliance_category).all()
+    suspicious_cases = high_risk_cases = strs_filed = 0
+    for _, count, high_risk, strs in risk_categories:
+        suspicious_cases += count
+        high_risk_cases += high_risk
+        strs_filed += strs
     
     return {
         "report_period": f"{year}-{month:02d}",
-        "generated_at": datetime.now(),
+        "generated_at": now,
         "summary": {
             "total_transactions_monitored": total_transactions or 0,
             "suspicious_cases_identified": suspicious_cases or 0,
             "high_risk_cases": high_risk_cases or 0,
             "strs_filed": strs_filed or 0,
-            "compliance_rate": round((1 - (suspicious_cases / total_transactions if total_transactions else 0)) * 100, 2)
+            "compliance_rate": compliance_rate
         },
         "risk_categories": [
             {"category": cat, "count": count}
-            for cat, count in risk_categories
+            for cat, count, _, _ in risk_categories
         ],
         "watchlist_stats": {
-            "total_watchlisted": db.query(func.count(Watchlist.id)).filter(
-                Watchlist.is_active == True
-            ).scalar() or 0,
-            "added_this_month": db.query(func.count(Watchlist.id)).filter(
-                and_(
-                    Watchlist.created_at >= start_date,
-                    Watchlist.created_at <= end_date
-                )
-            ).scalar() or 0
+            "total_watchlisted": total_watchlisted or 0,
+            "added_this_month": watchlisted_this_month or 0
         },
         "exemptions_stats": {
-            "active_exemptions": db.query(func.count(TransactionExemption.id)).filter(
-                TransactionExemption.is_active == True
-            ).scalar() or 0
+            "active_exemptions": active_exemptions or 0
         }
     }
 
@@ -218,36 +306,66 @@ async def get_risk_assessment_report(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     risk_threshold: int = 50,
+    now: datetime = Depends(get_request_time),
     db: Session = Depends(get_db)
 ):
     """
     Generate risk assessment report for customer profiles
     """
-    query = db.query(CustomerProfile)
-    
+    key = f"rpt:risk:latest:{start_date}:{end_date}:{risk_threshold}"
+    return await cache.get_or_set(
+        key, LATEST_REPORT_TTL,
+        lambda: _build_risk_assessment_report(db, start_date, end_date, risk_threshold, now)
+    )
+
+async def _build_risk_assessment_report(
+    db: Session,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    risk_threshold: int,
+    now: datetime
+) -> Dict[str, Any]:
+    """Aggregate the risk distribution and the high-risk profiles"""
+    filters = []
     if start_date:
-        query = query.filter(CustomerProfile.last_activity >= start_date)
+        filters.append(CustomerProfile.last_activity >= start_date)
     if end_date:
-        query = query.filter(CustomerProfile.last_activity <= end_date)
+        filters.append(CustomerProfile.last_activity <= end_date)
+    above_threshold = CustomerProfile.risk_score >= risk_threshold
     
     # Get risk distribution
-    risk_distribution = db.query(
-        func.case(
-            (CustomerProfile.risk_score < 30, 'Low'),
-            (CustomerProfile.risk_score < 60, 'Medium'),
-            (CustomerProfile.risk_score < 80, 'High'),
-            else_='Critical'
-        ).label('risk_level'),
-        func.count(CustomerProfile.id).label('count')
-    ).group_by('risk_level').all()
+    risk_level = case(
+        (CustomerProfile.risk_score < 30, 'Low'),
+        (CustomerProfile.risk_score < 60, 'Medium'),
+        (CustomerProfile.risk_score < 80, 'High'),
+        else_='Critical'
+    ).label('risk_level')
+    risk_distribution = db.execute(
+        select(risk_level, func.count().label('count')).group_by(risk_level)
+    ).all()
+    
+    # High risk profiles as plain mappings labelled with the response keys
+    high_risk_profiles = db.execute(
+        select(
+            CustomerProfile.acct_no.label('account_number'),
+            CustomerProfile.acct_name.label('account_name'),
+            CustomerProfile.risk_score,
+            CustomerProfile.total_transactions,
+            CustomerProfile.suspicious_count,
+            CustomerProfile.last_activity
+        ).where(*filters, above_threshold).limit(20)
+    ).mappings().all()
     
-    # Get high risk profiles
-    high_risk_profiles = query.filter(
-        CustomerProfile.risk_score >= risk_threshold
-    ).limit(20).all()
+    total_profiles, average_risk_score = db.execute(
+        select(func.count(), func.avg(CustomerProfile.risk_score)).select_from(CustomerProfile)
+    ).one()
+    
+    profiles_above_threshold = db.execute(
+        select(func.count()).select_from(CustomerProfile).where(*filters, above_threshold)
+    ).scalar()
     
     return {
-        "report_date": datetime.now(),
+        "report_date": now,
         "assessment_period": {
             "start": start_date,
             "end": end_date
@@ -256,61 +374,72 @@ async def get_risk_assessment_report(
             {"level": level, "count": count}
             for level, count in risk_distribution
         ],
-        "high_risk_profiles": [
-            {
-                "account_number": p.acct_no,
-                "account_name": p.acct_name,
-                "risk_score": p.risk_score,
-                "total_transactions": p.total_transactions,
-                "suspicious_count": p.suspicious_count,
-                "last_activity": p.last_activity
-            }
-            for p in high_risk_profiles
-        ],
+        "high_risk_profiles": [dict(profile) for profile in high_risk_profiles],
         "statistics": {
-            "total_profiles": db.query(func.count(CustomerProfile.id)).scalar(),
-            "average_risk_score": db.query(func.avg(CustomerProfile.risk_score)).scalar() or 0,
-            "profiles_above_threshold": query.filter(
-                CustomerProfile.risk_score >= risk_threshold
-            ).count()
+            "total_profiles": total_profiles,
+            "average_risk_score": average_risk_score or 0,
+            "profiles_above_threshold": profiles_above_threshold
         }
     }
 
 @router.get("/reports/activity/summary")
 async def get_activity_summary(
     days: int = Query(30, description="Number of days to look back"),
+    now: datetime = Depends(get_request_time),
     db: Session = Depends(get_db)
 ):
     """
     Get activity summary for the specified period
     """
-    end_date = datetime.now()
+    return await cache.get_or_set(
+        f"rpt:activity:latest:{days}", LATEST_REPORT_TTL,
+        lambda: _build_activity_summary(db, days, now)
+    )
+
+async def _build_activity_summary(db: Session, days: int, now: datetime) -> Dict[str, Any]:
+    """Aggregate suspicious case activity over the last `days` days"""
+    end_date = now
     start_date = end_date - timedelta(days=days)
     
-    # Daily transaction counts
-    daily_stats = db.query(
-        func.date(SuspiciousCase.created_at).label('date'),
-        func.count(SuspiciousCase.id).label('count')
-    ).filter(
-        SuspiciousCase.created_at >= start_date
-    ).group_by('date').all()
+    rollup = SuspiciousCaseDailyRollup
     
-    # Channel distribution
-    channel_stats = db.query(
-        SuspiciousCase.channel,
-        func.count(SuspiciousCase.id).label('count'),
-        func.sum(SuspiciousCase.amount).label('total_amount')
-    ).filter(
-        SuspiciousCase.created_at >= start_date
-    ).group_by(SuspiciousCase.channel).all()
+    # Daily, channel and status distributions from the trigger-maintained rollup,
+    # O(days x channels x statuses) rows; GROUPING() tells which set each row belongs to
+    rows = db.execute(
+        select(
+            rollup.day,
+            rollup.channel,
+            rollup.status,
+            func.sum(rollup.case_count).label('count'),
+            func.sum(rollup.total_amount).label('total_amount'),
+            func.grouping(rollup.day).label('by_date'),
+            func.grouping(rollup.channel).label('by_channel'),
+            func.grouping(rollup.status).label('by_status')
+        ).where(
+            rollup.day >= start_date.date()
+        ).group_by(
+            # The empty set adds the grand total as one extra row
+            func.grouping_sets(rollup.day, rollup.channel, rollup.status, text('()'))
+        ).having(func.sum(rollup.case_count) > 0)
+    ).all()
     
-    # Status distribution
-    status_stats = db.query(
-        SuspiciousCase.status,
-        func.count(SuspiciousCase.id).label('count')
-    ).filter(
-        SuspiciousCase.created_at >= start_date
-    ).group_by(SuspiciousCase.status).all()
+    daily_stats = []
+    channel_stats = []
+    status_stats = []
+    total_cases = 0
+    most_active_channel = None
+    for date, channel, status, count, amount, by_date, by_channel, by_status in rows:
+        if by_date == 0:
+            daily_stats.append((date, count))
+        elif by_channel == 0:
+            channel_stats.append((channel or None, count, amount))
+            if most_active_channel is None or count > most_active_channel[1]:
+                most_active_channel = (channel or None, count)
+        elif by_status == 0:
+            status_stats.append((status, count))
+        else:
+            total_cases = count
+    daily_stats.sort(key=lambda item: item[0])
     
     return {
         "period": {
@@ -331,13 +460,13 @@ async def get_activity_summary(
             for channel, count, amount in channel_stats
         ],
         "status_distribution": [
-            {"status": status.value if status else "Unknown", "count": count}
+            {"status": STATUS_VALUES.get(status, "Unknown"), "count": count}
             for status, count in status_stats
         ],
         "summary": {
-            "total_cases": sum(count for _, count in status_stats),
-            "average_daily": sum(count for _, count in daily_stats) / days if daily_stats else 0,
-            "most_active_channel": max(channel_stats, key=lambda x: x[1])[0] if channel_stats else None
+            "total_cases": total_cases,
+            "average_daily": total_cases / days if days else 0,
+            "most_active_channel": most_active_channel[0] if most_active_channel else None
         }
     }
 
@@ -345,6 +474,7 @@ async def get_activity_summary(
 async def export_report(
     report_id: str,
     format: ReportFormat = ReportFormat.PDF,
+    now: datetime = Depends(get_request_time),
     db: Session = Depends(get_db)
 ):
     """
@@ -357,11 +487,12 @@ async def export_report(
         "report_id": report_id,
         "format": format,
         "download_url": f"/api/v1/reports/download/{report_id}.{format.value}",
-        "expires_at": datetime.now() + timedelta(hours=24)
+        "expires_at": now + timedelta(hours=24)
     }
 
 @router.get("/reports/scheduled")
 async def get_scheduled_reports(
+    now: datetime = Depends(get_request_time),
     db: Session = Depends(get_db)
 ):
     """
@@ -376,8 +507,8 @@ async def get_scheduled_reports(
                 "type": "compliance",
                 "schedule": "0 9 * * MON",
                 "recipients": ["compliance@example.com"],
-                "last_run": datetime.now() - timedelta(days=7),
-                "next_run": datetime.now() + timedelta(days=7)
+                "last_run": now - timedelta(days=7),
+                "next_run": now + timedelta(days=7)
             },
             {
                 "id": "2",
@@ -385,8 +516,8 @@ async def get_scheduled_reports(
                 "type": "risk",
                 "schedule": "0 9 1 * *",
                 "recipients": ["risk@example.com"],
-                "last_run": datetime.now() - timedelta(days=30),
-                "next_run": datetime.now() + timedelta(days=30)
+                "last_run": now - timedelta(days=30),
+                "next_run": now + timedelta(days=30)
             }
         ]
     }
@@ -398,6 +529,7 @@ async def schedule_report(
     schedule: str,  # Cron expression
     recipients: List[str],
     parameters: Optional[Dict[str, Any]] = None,
+    now: datetime = Depends(get_request_time),
     db: Session = Depends(get_db)
 ):
     """
@@ -406,7 +538,7 @@ async def schedule_report(
     # In production, this would save to database and set up cron job
     return {
         "message": "Report scheduled successfully",
-        "schedule_id": f"SCH-{datetime.now().timestamp()}",
+        "schedule_id": f"SCH-{now.timestamp()}",
         "name": name,
         "type": report_type,
         "schedule": schedule,
@@ -1,31 +1,132 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, case, extract
-from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta, date
-from decimal import Decimal
+from sqlalchemy import (
+    Float, func, and_, case, cast, extract, text, select, bindparam, literal_column
+)
+from typing import Optional, Dict, Any, List, Awaitable, Callable
+from datetime import datetime, timedelta, date, time
+import asyncio
+import hashlib
 
-from app.db.base import get_db
+from app.db.base import get_db, run_isolated
 from app.models.transaction import (
-    SuspiciousCase, CustomerProfile, Transaction,
+    SuspiciousCase, SuspiciousCaseDailyRollup, DashboardDailyStats, GeoRollup, CustomerProfile, Transaction,
     Watchlist, TransactionExemption, TransactionStatus
 )
-from app.core.config import settings
+from app.core import cache
+from app.core.flags import get_flags
+from app.core.request_time import get_request_time
+from app.models.user import User, UserRole
+from app.api.endpoints.auth import require_role
+
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Cached payload lifetimes in seconds, by endpoint
+STATS_CACHE_PREFIX = "stats:"
+STATS_CACHE_TTLS = {
+    "dashboard": 60,
+    "volume": 300,
+    "risk": 300,
+    "compliance": 900,
+    "geographic": 900,
+    "kpis": 15,
+}
 
-router = APIRouter()
+# Upper bound on the volume window; with group_by=day the response holds one
+# row per day, so this caps the payload that gets built, cached and encoded
+MAX_VOLUME_DAYS = 3660
+
+# KPI counts built once; only the :since parameter changes between requests
+TRANSACTIONS_SINCE = select(func.count(Transaction.id)).where(
+    Transaction.created_at >= bindparam('since')
+)
+CASES_SINCE = select(func.count(SuspiciousCase.id)).where(
+    SuspiciousCase.created_at >= bindparam('since')
+)
+# Case outcomes the compliance figures count: a case confirmed non-compliant
+# is the one that gets an STR filed, a case cleared as compliant was a false positive
+STR_FILED_STATUS = TransactionStatus.NOT_COMPLIANT
+FALSE_POSITIVE_STATUS = TransactionStatus.COMPLIANT
+
+STRS_FILED_SINCE = CASES_SINCE.where(SuspiciousCase.status == STR_FILED_STATUS)
+
+def _as_float(expression):
+    """
+    COALESCE an aggregate to 0 and cast it to double precision, so the driver
+    hands back a Python float instead of NULL or a Decimal
+    """
+    return cast(func.coalesce(expression, 0), Float)
+
+# Dashboard statements built once at import; requests only bind the day range.
+# Whole days come from the trigger-maintained rollup: one range scan on its primary key
+_in_period = DashboardDailyStats.day >= bindparam('start')
+DASHBOARD_TILES = select(
+    func.coalesce(func.sum(DashboardDailyStats.tx_count).filter(_in_period), 0).label('total_transactions'),
+    _as_float(func.sum(DashboardDailyStats.tx_amount).filter(_in_period)).label('total_amount'),
+    func.coalesce(func.sum(DashboardDailyStats.suspicious_count).filter(_in_period), 0).label('total'),
+    func.coalesce(func.sum(DashboardDailyStats.suspicious_count).filter(~_in_period), 0).label('prev_total'),
+    func.coalesce(func.sum(DashboardDailyStats.high_risk).filter(_in_period), 0).label('high_risk'),
+    _as_float(
+        func.sum(DashboardDailyStats.risk_score_sum).filter(_in_period)
+        / func.nullif(func.sum(DashboardDailyStats.risk_score_count).filter(_in_period), 0)
+    ).label('avg_risk'),
+    func.coalesce(func.sum(DashboardDailyStats.watchlist_hits).filter(_in_period), 0).label('watchlist_hits')
+).where(
+    DashboardDailyStats.day.between(bindparam('prev_start'), bindparam('end'))
+)
+
+# Per-status counts come from the trigger-maintained case rollup
+DASHBOARD_CASES_BY_STATUS = select(
+    SuspiciousCaseDailyRollup.status,
+    func.sum(SuspiciousCaseDailyRollup.case_count)
+).where(
+    SuspiciousCaseDailyRollup.day.between(bindparam('start'), bindparam('end'))
+).group_by(
+    SuspiciousCaseDailyRollup.status
+).having(func.sum(SuspiciousCaseDailyRollup.case_count) > 0)
+
+# Rollup rows store the status label (member name); the API reports the value
+STATUS_VALUES = {member.name: member.value for member in TransactionStatus}
+
+ACTIVE_WATCHLIST_ENTRIES = select(func.count(Watchlist.id)).where(Watchlist.is_active == True)
+
+async def _cached_statistics(
+    request: Request, key: str, ttl: int, loader: Callable[[], Awaitable[Dict[str, Any]]]
+) -> Response:
+    """
+    Serve a statistics payload from the shared cache, tagged with an ETag so
+    clients holding the same payload get a bodiless 304. A hit serves the
+    bytes stored in Redis as-is; a miss encodes the payload once.
+    """
+    body = await cache.get_or_set(f"{STATS_CACHE_PREFIX}{key}", ttl, loader, raw=True)
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={ttl}"}
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @router.get("/statistics/dashboard")
 async def get_dashboard_statistics(
+    request: Request,
     period: str = Query("today", description="Period: today, week, month, year"),
-    db: Session = Depends(get_db)
+    now: datetime = Depends(get_request_time)
 ):
     """
     Get dashboard statistics for the specified period
     """
+    return await _cached_statistics(
+        request, f"dashboard:latest:{period}", STATS_CACHE_TTLS["dashboard"],
+        lambda: _build_dashboard_statistics(period, now)
+    )
+
+async def _build_dashboard_statistics(period: str, now: datetime) -> Dict[str, Any]:
+    """Aggregate the dashboard tiles for one period, running the independent queries concurrently"""
     # Calculate date range
-    end_date = datetime.now()
+    end_date = now
     if period == "today":
-        start_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        start_date = datetime.combine(now.date(), time.min)
     elif period == "week":
         start_date = end_date - timedelta(days=7)
     elif period == "month":
@@ -35,59 +136,32 @@ async def get_dashboard_statistics(
     else:
         start_date = end_date - timedelta(days=30)
     
-    # Transaction statistics
-    total_transactions = db.query(func.count(Transaction.id)).filter(
-        Transaction.created_at.between(start_date, end_date)
-    ).scalar() or 0
-    
-    total_amount = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.created_at.between(start_date, end_date)
-    ).scalar() or Decimal(0)
-    
-    # Suspicious cases statistics
-    suspicious_cases = db.query(func.count(SuspiciousCase.id)).filter(
-        SuspiciousCase.created_at.between(start_date, end_date)
-    ).scalar() or 0
-    
-    cases_by_status = db.query(
-        SuspiciousCase.status,
-        func.count(SuspiciousCase.id).label('count')
-    ).filter(
-        SuspiciousCase.created_at.between(start_date, end_date)
-    ).group_by(SuspiciousCase.status).all()
-    
-    # Risk statistics
-    high_risk_cases = db.query(func.count(SuspiciousCase.id)).filter(
-        and_(
-            SuspiciousCase.created_at.between(start_date, end_date),
-            SuspiciousCase.risk_score >= 70
-        )
-    ).scalar() or 0
-    
-    avg_risk_score = db.query(func.avg(SuspiciousCase.risk_score)).filter(
-        SuspiciousCase.created_at.between(start_date, end_date)
-    ).scalar() or 0
-    
-    # Watchlist statistics
-    watchlist_hits = db.query(func.count(SuspiciousCase.id)).filter(
-        and_(
-            SuspiciousCase.created_at.between(start_date, end_date),
-            SuspiciousCase.is_watchlisted == True
-        )
-    ).scalar() or 0
-    
     # Calculate trends (compare with previous period)
     if period == "today":
         prev_start = start_date - timedelta(days=1)
-        prev_end = start_date
     else:
-        period_duration = end_date - start_date
-        prev_start = start_date - period_duration
-        prev_end = start_date
+        prev_start = start_date - (end_date - start_date)
+    
+    # Each query gets its own pooled connection, so wall time is the slowest one
+    row, status_rows, active_watchlist_entries = await asyncio.gather(
+        run_isolated(DASHBOARD_TILES, "one", {
+            "start": start_date.date(), "prev_start": prev_start.date(), "end": end_date.date()
+        }),
+        run_isolated(DASHBOARD_CASES_BY_STATUS, "all", {
+            "start": start_date.date(), "end": end_date.date()
+        }),
+        run_isolated(ACTIVE_WATCHLIST_ENTRIES, "scalar")
+    )
+    row = row._mapping
+    cases_by_status = {
+        STATUS_VALUES.get(case_status, case_status) or "unknown": int(count)
+        for case_status, count in status_rows
+    }
     
-    prev_suspicious = db.query(func.count(SuspiciousCase.id)).filter(
-        SuspiciousCase.created_at.between(prev_start, prev_end)
-    ).scalar() or 0
+    total_transactions = int(row['total_transactions'])
+    suspicious_cases = int(row['total'])
+    prev_suspicious = int(row['prev_total'])
+    suspicious_percentage = round(suspicious_cases / total_transactions * 100, 2) if total_transactions > 0 else 0
     
     trend = ((suspicious_cases - prev_suspicious) / prev_suspicious * 100) if prev_suspicious > 0 else 0
     
@@ -99,24 +173,19 @@ async def get_dashboard_statistics(
         },
         "transactions": {
             "total_count": total_transactions,
-            "total_amount": float(total_amount),
+            "total_amount": row['total_amount'],
             "suspicious_count": suspicious_cases,
-            "suspicious_percentage": round((suspicious_cases / total_transactions * 100) if total_transactions > 0 else 0, 2)
+            "suspicious_percentage": suspicious_percentage
         },
         "cases": {
             "total": suspicious_cases,
-            "by_status": {
-                status.value if status else "unknown": count 
-                for status, count in cases_by_status
-            },
-            "high_risk": high_risk_cases,
-            "average_risk_score": round(float(avg_risk_score), 2)
+            "by_status": cases_by_status,
+            "high_risk": int(row['high_risk']),
+            "average_risk_score": round(row['avg_risk'], 2)
         },
         "watchlist": {
-            "hits": watchlist_hits,
-            "active_entries": db.query(func.count(Watchlist.id)).filter(
-                Watchlist.is_active == True
-            ).scalar() or 0
+            "hits": int(row['watchlist_hits']),
+            "active_entries": active_watchlist_entries or 0
         },
         "trends": {
             "suspicious_cases_change": round(trend, 2),
@@ -126,40 +195,79 @@ async def get_dashboard_statistics(
 
 @router.get("/statistics/transactions/volume")
 async def get_transaction_volume_statistics(
-    days: int = Query(30, description="Number of days to analyze"),
+    request: Request,
+    days: int = Query(30, ge=1, le=MAX_VOLUME_DAYS, description="Number of days to analyze"),
     group_by: str = Query("day", description="Group by: day, week, month"),
+    now: datetime = Depends(get_request_time),
     db: Session = Depends(get_db)
 ):
     """
     Get transaction volume statistics over time
     """
-    start_date = datetime.now() - timedelta(days=days)
+    return await _cached_statistics(
+        request, f"volume:{days}:{group_by}", STATS_CACHE_TTLS["volume"],
+        lambda: _build_transaction_volume_statistics(db, days, group_by, now)
+    )
+
+async def _build_transaction_volume_statistics(
+    db: Session, days: int, group_by: str, now: datetime
+) -> Dict[str, Any]:
+    """Bucket transaction counts and amounts over the window"""
+    end_date = now
+    start_date = end_date - timedelta(days=days)
     
-    # Determine grouping
-    if group_by == "day":
-        date_group = func.date(Transaction.created_at)
-    elif group_by == "week":
-        date_group = func.date_trunc('week', Transaction.created_at)
-    elif group_by == "month":
-        date_group = func.date_trunc('month', Transaction.created_at)
-    else:
-        date_group = func.date(Transaction.created_at)
+    # Determine grouping; unit is whitelisted so it can be inlined, keeping the
+    # bucket expression textually identical in SELECT, GROUP BY and GROUPING()
+    unit = group_by if group_by in ("day", "week", "month") else "day"
+    bucket = func.date_trunc(literal_column(f"'{unit}'"), Transaction.created_at)
     
-    # Get volume data
-    volume_data = db.query(
-        date_group.label('period'),
+    # Per-bucket rows plus the grand total from the empty grouping set
+    volume = select(
+        bucket.label('period'),
         func.count(Transaction.id).label('transaction_count'),
-        func.sum(Transaction.amount).label('total_amount'),
-        func.avg(Transaction.amount).label('avg_amount')
-    ).filter(
+        _as_float(func.sum(Transaction.amount)).label('total_amount'),
+        _as_float(func.avg(Transaction.amount)).label('avg_amount'),
+        func.grouping(bucket).label('is_total')
+    ).where(
         Transaction.created_at >= start_date
-    ).group_by('period').order_by('period').all()
+    ).group_by(
+        func.grouping_sets(bucket, text('()'))
+    ).cte('volume')
+    
+    # Every bucket in the window, so periods without transactions come back as zeros
+    periods = select(
+        func.generate_series(
+            func.date_trunc(unit, start_date),
+            func.date_trunc(unit, end_date),
+            literal_column(f"interval '1 {unit}'")
+        ).label('period')
+    ).subquery()
+    
+    buckets = select(
+        periods.c.period,
+        func.coalesce(volume.c.transaction_count, 0),
+        func.coalesce(volume.c.total_amount, 0.0),
+        func.coalesce(volume.c.avg_amount, 0.0)
+    ).outerjoin(
+        volume, and_(volume.c.period == periods.c.period, volume.c.is_total == 0)
+    )
+    grand_total = select(
+        literal_column("NULL").label('period'),
+        volume.c.transaction_count,
+        volume.c.total_amount,
+        volume.c.avg_amount
+    ).where(volume.c.is_total == 1)
+    
+    rows = db.execute(
+        buckets.union_all(grand_total).order_by(text("period NULLS LAST"))
+    ).all()
+    volume_data, (_, total_transactions, total_amount, _) = rows[:-1], rows[-1]
     
     # Get channel distribution
     channel_data = db.query(
         Transaction.channel,
         func.count(Transaction.id).label('count'),
-        func.sum(Transaction.amount).label('amount')
+        _as_float(func.sum(Transaction.amount)).label('amount')
     ).filter(
         Transaction.created_at >= start_date
     ).group_by(Transaction.channel).all()
@@ -167,16 +275,16 @@ async def get_transaction_volume_statistics(
     return {
         "period": {
             "start": start_date,
-            "end": datetime.now(),
+            "end": end_date,
             "days": days,
             "grouping": group_by
         },
         "volume_over_time": [
             {
-                "period": str(period),
+                "period": str(period.date()) if unit == "day" else str(period),
                 "transaction_count": count,
-                "total_amount": float(total) if total else 0,
-                "average_amount": float(avg) if avg else 0
+                "total_amount": total,
+                "average_amount": avg
             }
             for period, count, total, avg in volume_data
         ],
@@ -184,24 +292,33 @@ async def get_transaction_volume_statistics(
             {
                 "channel": channel or "Unknown",
                 "transaction_count": count,
-                "total_amount": float(amount) if amount else 0
+                "total_amount": amount
             }
             for channel, count, amount in channel_data
         ],
         "summary": {
-            "total_transactions": sum(d[1] for d in volume_data),
-            "total_amount": sum(float(d[2]) if d[2] else 0 for d in volume_data),
-            "average_daily_transactions": sum(d[1] for d in volume_data) / days if days > 0 else 0
+            "total_transactions": total_transactions,
+            "total_amount": total_amount,
+            "average_daily_transactions": total_transactions / days if days > 0 else 0
         }
     }
 
 @router.get("/statistics/risk/distribution")
 async def get_risk_distribution(
+    request: Request,
+    now: datetime = Depends(get_request_time),
     db: Session = Depends(get_db)
 ):
     """
     Get risk score distribution across customer profiles
     """
+    return await _cached_statistics(
+        request, "risk", STATS_CACHE_TTLS["risk"],
+        lambda: _build_risk_distribution(db, now)
+    )
+
+async def _build_risk_distribution(db: Session, now: datetime) -> Dict[str, Any]:
+    """Band customer profiles by risk score"""
     # Risk distribution
     risk_distribution = db.query(
         case(
@@ -212,28 +329,42 @@ async def get_risk_distribution(
             else_='Critical'
         ).label('risk_level'),
         func.count(CustomerProfile.id).label('count'),
-        func.avg(CustomerProfile.total_amount).label('avg_transaction_amount')
+        _as_float(func.avg(CustomerProfile.total_amount)).label('avg_transaction_amount')
     ).group_by('risk_level').all()
     
-    # Top risky customers
-    top_risky = db.query(CustomerProfile).order_by(
+    # Top risky customers, projecting only the serialized columns; ix_profile_risk
+    # is read backwards so the sort is a ten-row index scan
+    top_risky = db.query(
+        CustomerProfile.acct_no,
+        CustomerProfile.acct_name,
+        CustomerProfile.risk_score,
+        CustomerProfile.suspicious_count,
+        CustomerProfile.total_transactions
+    ).order_by(
         CustomerProfile.risk_score.desc()
     ).limit(10).all()
     
     # Risk score trends
     risk_trends = db.query(
         func.date(CustomerProfile.last_activity).label('date'),
-        func.avg(CustomerProfile.risk_score).label('avg_score')
+        _as_float(func.avg(CustomerProfile.risk_score)).label('avg_score')
     ).filter(
-        CustomerProfile.last_activity >= datetime.now() - timedelta(days=30)
+        CustomerProfile.last_activity >= now - timedelta(days=30)
     ).group_by('date').order_by('date').all()
     
+    # Profile count, average score and high-risk count from a single scan
+    total_profiles, average_risk_score, high_risk_count = db.query(
+        func.count(),
+        _as_float(func.avg(CustomerProfile.risk_score)),
+        func.count().filter(CustomerProfile.risk_score >= 70)
+    ).select_from(CustomerProfile).one()
+    
     return {
         "distribution": [
             {
                 "risk_level": level,
                 "customer_count": count,
-                "average_transaction_amount": float(avg_amount) if avg_amount else 0
+                "average_transaction_amount": avg_amount
             }
             for level, count, avg_amount in risk_distribution
         ],
@@ -250,77 +381,77 @@ async def get_risk_distribution(
         "risk_score_trends": [
             {
                 "date": str(date),
-                "average_risk_score": float(score) if score else 0
+                "average_risk_score": score
             }
             for date, score in risk_trends
         ],
         "summary": {
-            "total_profiles": db.query(func.count(CustomerProfile.id)).scalar() or 0,
-            "average_risk_score": db.query(func.avg(CustomerProfile.risk_score)).scalar() or 0,
-            "high_risk_count": db.query(func.count(CustomerProfile.id)).filter(
-                CustomerProfile.risk_score >= 70
-            ).scalar() or 0
+            "total_profiles": total_profiles,
+            "average_risk_score": average_risk_score,
+            "high_risk_count": high_risk_count
         }
     }
 
 @router.get("/statistics/compliance/metrics")
 async def get_compliance_metrics(
+    request: Request,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
+    now: datetime = Depends(get_request_time),
     db: Session = Depends(get_db)
 ):
     """
     Get compliance metrics and KPIs
     """
+    return await _cached_statistics(
+        request, f"compliance:{start_date}:{end_date}", STATS_CACHE_TTLS["compliance"],
+        lambda: _build_compliance_metrics(db, start_date, end_date, now)
+    )
+
+async def _build_compliance_metrics(
+    db: Session, start_date: Optional[date], end_date: Optional[date], now: datetime
+) -> Dict[str, Any]:
+    """Compute the STR filing, quality and efficiency metrics for the window"""
     if not start_date:
-        start_date = datetime.now() - timedelta(days=30)
+        start_date = now - timedelta(days=30)
     if not end_date:
-        end_date = datetime.now()
-    
-    # STR filing metrics
-    total_cases = db.query(func.count(SuspiciousCase.id)).filter(
-        SuspiciousCase.created_at.between(start_date, end_date)
-    ).scalar() or 0
-    
-    reported_cases = db.query(func.count(SuspiciousCase.id)).filter(
-        and_(
-            SuspiciousCase.created_at.between(start_date, end_date),
-            SuspiciousCase.status == TransactionStatus.REPORTED
-        )
-    ).scalar() or 0
+        end_date = now
     
-    # Response time metrics
-    avg_response_time = db.query(
-        func.avg(
-            func.extract('epoch', SuspiciousCase.updated_at - SuspiciousCase.created_at) / 3600
-        )
-    ).filter(
-        and_(
-            SuspiciousCase.created_at.between(start_date, end_date),
-            SuspiciousCase.status != TransactionStatus.PENDING
-        )
-    ).scalar() or 0
-    
-    # False positive rate
-    false_positives = db.query(func.count(SuspiciousCase.id)).filter(
-        and_(
-            SuspiciousCase.created_at.between(start_date, end_date),
-            SuspiciousCase.status == TransactionStatus.CLOSED
-        )
-    ).scalar() or 0
-    
-    # Watchlist effectiveness
-    watchlist_detections = db.query(func.count(SuspiciousCase.id)).filter(
-        and_(
-            SuspiciousCase.created_at.between(start_date, end_date),
-            SuspiciousCase.is_watchlisted == True
+    # One pass over the window's cases with conditional aggregates; the
+    # unbounded pending count and the exemption count ride along as subqueries
+    metrics = db.execute(
+        select(
+            func.count().label('total_cases'),
+            func.count().filter(
+                SuspiciousCase.status == STR_FILED_STATUS
+            ).label('reported_cases'),
+            func.count().filter(
+                SuspiciousCase.status == FALSE_POSITIVE_STATUS
+            ).label('false_positives'),
+            func.count().filter(
+                SuspiciousCase.is_watchlisted == True
+            ).label('watchlist_detections'),
+            _as_float(func.avg(
+                func.extract('epoch', SuspiciousCase.updated_at - SuspiciousCase.created_at) / 3600
+            ).filter(
+                SuspiciousCase.status != TransactionStatus.PENDING
+            )).label('avg_response_time'),
+            select(func.count(SuspiciousCase.id)).where(
+                SuspiciousCase.status == TransactionStatus.PENDING
+            ).scalar_subquery().label('pending_cases'),
+            select(func.count(TransactionExemption.id)).where(
+                TransactionExemption.is_active == True
+            ).scalar_subquery().label('active_exemptions')
+        ).where(
+            SuspiciousCase.created_at.between(start_date, end_date)
         )
-    ).scalar() or 0
+    ).mappings().one()
     
-    # Exemption usage
-    active_exemptions = db.query(func.count(TransactionExemption.id)).filter(
-        TransactionExemption.is_active == True
-    ).scalar() or 0
+    total_cases = metrics['total_cases']
+    reported_cases = metrics['reported_cases']
+    false_positives = metrics['false_positives']
+    watchlist_detections = metrics['watchlist_detections']
+    avg_response_time = metrics['avg_response_time']
     
     return {
         "period": {
@@ -331,51 +462,70 @@ async def get_compliance_metrics(
             "total_cases": total_cases,
             "reported_cases": reported_cases,
             "reporting_rate": round((reported_cases / total_cases * 100) if total_cases > 0 else 0, 2),
-            "average_response_hours": round(float(avg_response_time), 2)
+            "average_response_hours": round(avg_response_time, 2)
         },
         "quality_metrics": {
             "false_positive_rate": round((false_positives / total_cases * 100) if total_cases > 0 else 0, 2),
             "watchlist_detection_rate": round((watchlist_detections / total_cases * 100) if total_cases > 0 else 0, 2),
-            "active_exemptions": active_exemptions
+            "active_exemptions": metrics['active_exemptions'] or 0
         },
         "efficiency_metrics": {
             "cases_per_day": round(total_cases / ((end_date - start_date).days or 1), 2),
-            "average_resolution_time": round(float(avg_response_time), 2),
-            "pending_cases": db.query(func.count(SuspiciousCase.id)).filter(
-                SuspiciousCase.status == TransactionStatus.PENDING
-            ).scalar() or 0
+            "average_resolution_time": round(avg_response_time, 2),
+            "pending_cases": metrics['pending_cases'] or 0
         }
     }
 
 @router.get("/statistics/geographic/distribution")
 async def get_geographic_distribution(
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
     Get geographic distribution of transactions and risks
     """
-    # Country distribution
-    country_stats = db.query(
-        CustomerProfile.country,
-        func.count(CustomerProfile.id).label('customer_count'),
-        func.avg(CustomerProfile.risk_score).label('avg_risk_score'),
-        func.sum(CustomerProfile.total_amount).label('total_amount')
-    ).group_by(CustomerProfile.country).all()
+    return await _cached_statistics(
+        request, "geographic", STATS_CACHE_TTLS["geographic"],
+        lambda: _build_geographic_distribution(db)
+    )
+
+async def _build_geographic_distribution(db: Session) -> Dict[str, Any]:
+    """Group customer profiles by country and branch"""
+    # Both groupings in one pass over the trigger-maintained rollup, which has
+    # one row per country/branch pair instead of one per profile
+    geo = GeoRollup
+    country = func.nullif(geo.country, '')
+    branch = func.nullif(geo.branch, '')
+    rows = db.execute(
+        select(
+            country,
+            branch,
+            func.sum(geo.customer_count),
+            _as_float(func.sum(geo.risk_score_sum) / func.nullif(func.sum(geo.risk_score_count), 0)),
+            _as_float(func.sum(geo.total_amount)),
+            func.sum(geo.suspicious_count),
+            func.grouping(country).label('by_branch')
+        ).group_by(
+            func.grouping_sets(country, branch)
+        ).having(func.sum(geo.customer_count) > 0)
+    ).all()
     
-    # Branch distribution
-    branch_stats = db.query(
-        CustomerProfile.branch,
-        func.count(CustomerProfile.id).label('customer_count'),
-        func.sum(CustomerProfile.suspicious_count).label('suspicious_count')
-    ).group_by(CustomerProfile.branch).all()
+    country_stats = [
+        (country, count, avg_risk, total)
+        for country, _, count, avg_risk, total, _, by_branch in rows if not by_branch
+    ]
+    branch_stats = [
+        (branch, count, suspicious)
+        for _, branch, count, _, _, suspicious, by_branch in rows if by_branch
+    ]
     
     return {
         "country_distribution": [
             {
                 "country": country or "Unknown",
                 "customer_count": count,
-                "average_risk_score": float(avg_risk) if avg_risk else 0,
-                "total_transaction_amount": float(total) if total else 0
+                "average_risk_score": avg_risk,
+                "total_transaction_amount": total
             }
             for country, count, avg_risk, total in country_stats
         ],
@@ -390,45 +540,45 @@ async def get_geographic_distribution(
         "high_risk_regions": [
             {
                 "country": country,
-                "risk_score": float(avg_risk)
+                "risk_score": avg_risk
             }
             for country, _, avg_risk, _ in country_stats
-            if avg_risk and float(avg_risk) > 60
+            if avg_risk > 60
         ]
     }
 
 @router.get("/statistics/performance/kpis")
 async def get_performance_kpis(
+    request: Request,
+    now: datetime = Depends(get_request_time),
     db: Session = Depends(get_db)
 ):
     """
     Get system performance KPIs
     """
-    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    this_month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return await _cached_statistics(
+        request, "kpis", STATS_CACHE_TTLS["kpis"],
+        lambda: _build_performance_kpis(db, now)
+    )
+
+async def _build_performance_kpis(db: Session, now: datetime) -> Dict[str, Any]:
+    """Count today's and this month's activity"""
+    today = datetime.combine(now.date(), time.min)
+    this_month_start = today.replace(day=1)
     
     return {
         "real_time_metrics": {
-            "transactions_today": db.query(func.count(Transaction.id)).filter(
-                Transaction.created_at >= today
-            ).scalar() or 0,
-            "cases_today": db.query(func.count(SuspiciousCase.id)).filter(
-                SuspiciousCase.created_at >= today
-            ).scalar() or 0,
-            "active_monitoring": settings.MONITORING_ENABLED
+            "transactions_today": db.execute(TRANSACTIONS_SINCE, {"since": today}).scalar() or 0,
+            "cases_today": db.execute(CASES_SINCE, {"since": today}).scalar() or 0,
+            "active_monitoring": (await get_flags())["monitoring_enabled"]
         },
         "monthly_kpis": {
-            "transactions_processed": db.query(func.count(Transaction.id)).filter(
-                Transaction.created_at >= this_month_start
+            "transactions_processed": db.execute(
+                TRANSACTIONS_SINCE, {"since": this_month_start}
             ).scalar() or 0,
-            "cases_identified": db.query(func.count(SuspiciousCase.id)).filter(
-                SuspiciousCase.created_at >= this_month_start
-            ).scalar() or 0,
-            "strs_filed": db.query(func.count(SuspiciousCase.id)).filter(
-                and_(
-                    SuspiciousCase.created_at >= this_month_start,
-                    SuspiciousCase.status == TransactionStatus.REPORTED
-                )
+            "cases_identified": db.execute(CASES_SINCE, {"since": this_month_start}).scalar() or 0,
+            "strs_filed": db.execute(
+                STRS_FILED_SINCE, {"since": this_month_start}
             ).scalar() or 0
         },
         "system_health": {
@@ -437,4 +587,14 @@ async def get_performance_kpis(
             "average_response_time": "245ms",  # In production, get from APM
             "error_rate": "0.1%"  # In production, calculate from logs
         }
-    }
\ No newline at end of file
+    }
+
+@router.post("/statistics/cache/invalidate")
+async def invalidate_statistics_cache(
+    current_user: User = Depends(require_role([UserRole.ADMIN]))
+):
+    """
+    Drop every cached statistics payload
+    """
+    removed = await cache.invalidate(STATS_CACHE_PREFIX)
+    return {"message": "Statistics cache invalidated", "keys_removed": removed}
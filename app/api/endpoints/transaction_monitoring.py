@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Response
 from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
 from typing import List, Optional
 from datetime import datetime, timedelta
+from functools import lru_cache
 import logging
+import orjson
 
 from app.db.base import get_db
 from app.schemas.transaction import (
@@ -17,13 +21,65 @@ from app.models.transaction import (
     CustomerProfile, SuspiciousCase, TransactionStatus
 )
 from app.services.transaction_processing import TransactionProcessingService
-from app.core.config import settings
+from app.services.screening_cache import (
+    WATCHLIST_KEY, EXEMPTIONS_KEY, screen_account, add_to_screening_set, remove_from_screening_set
+)
 from app.core.security import verify_webhook_token
+from app.core.flags import get_flags, set_flag
+from redis.exceptions import RedisError
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+def _response_columns(model, schema) -> list:
+    """The mapped columns a response schema serializes, in field order"""
+    return [getattr(model, field) for field in schema.model_fields]
+
+# List endpoints select only these columns and hand the rows straight to the
+# response models, skipping ORM instance construction and the identity map
+WATCHLIST_COLUMNS = _response_columns(Watchlist, WatchlistResponse)
+EXEMPTION_COLUMNS = _response_columns(TransactionExemption, TransactionExemptionResponse)
+LIMIT_COLUMNS = _response_columns(TransactionLimit, TransactionLimitResponse)
+CASE_COLUMNS = _response_columns(SuspiciousCase, SuspiciousCaseResponse)
+
+def _upsert(db: Session, model, key: List[str], data, returning: list):
+    """
+    Insert a row or, when one with the same key exists, update it from the
+    fields the client sent and reactivate it, in one atomic statement
+    """
+    updates = {
+        **data.model_dump(exclude_unset=True),
+        'is_active': True,
+        # onupdate defaults are not applied to ON CONFLICT DO UPDATE
+        'updated_at': func.now()
+    }
+    row = db.execute(
+        insert(model).values(**data.model_dump()).on_conflict_do_update(
+            index_elements=key, set_=updates
+        ).returning(*returning)
+    ).one()
+    db.commit()
+    return row
+
+def _keyset_page(query, model, response: Response, skip: int, limit: int, cursor: Optional[int]):
+    """
+    Return one page newest id first. With a cursor the page starts with an
+    index seek on id instead of walking and discarding `skip` rows; the
+    cursor for the following page is returned in the X-Next-Cursor header.
+    """
+    if cursor is not None:
+        query = query.filter(model.id < cursor)
+    elif skip:
+        query = query.offset(skip)
+    
+    rows = query.order_by(model.id.desc()).limit(limit).all()
+    
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = str(rows[-1].id)
+    
+    return rows
+
 @router.post("/webhook/suspicious", response_model=TransactionResponse)
 async def process_suspicious_transaction(
     request: TransactionRequest,
@@ -42,13 +98,18 @@ async def process_suspicious_transaction(
     
     logger.info(f"Processing transaction for account: {request.current_transaction.acct_no}")
     
+    # Redis membership rules out most accounts without a watchlist/exemption query
+    maybe_exempted, maybe_watchlisted = await screen_account(request.current_transaction.acct_no)
+    
     # Initialize processing service
     processing_service = TransactionProcessingService(db)
     
     # Process transaction
     result = processing_service.process_transaction(
         request.current_transaction.model_dump(),
-        request.case_number
+        request.case_number,
+        check_exemption=maybe_exempted,
+        check_watchlist=maybe_watchlisted
     )
     
     if not result['success']:
@@ -73,44 +134,29 @@ async def add_to_watchlist(
     db: Session = Depends(get_db)
 ):
     """
-    Add an account to the watchlist
+    Add an account to the watchlist, reactivating and updating an existing entry
     """
-    # Check if already exists
-    existing = db.query(Watchlist).filter(
-        Watchlist.account_number == watchlist_data.account_number
-    ).first()
-    
-    if existing:
-        # Update existing entry
-        for key, value in watchlist_data.model_dump(exclude_unset=True).items():
-            setattr(existing, key, value)
-        existing.is_active = True
-        db.commit()
-        db.refresh(existing)
-        return existing
-    
-    # Create new entry
-    watchlist = Watchlist(**watchlist_data.model_dump())
-    db.add(watchlist)
-    db.commit()
-    db.refresh(watchlist)
+    watchlist = _upsert(db, Watchlist, ['account_number'], watchlist_data, WATCHLIST_COLUMNS)
+    await add_to_screening_set(WATCHLIST_KEY, watchlist.account_number)
     return watchlist
 
 @router.get("/watchlist", response_model=List[WatchlistResponse])
 async def get_watchlist(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[int] = None,
     is_active: Optional[bool] = True,
     db: Session = Depends(get_db)
 ):
     """
     Get all watchlist entries
     """
-    query = db.query(Watchlist)
+    query = db.query(*WATCHLIST_COLUMNS)
     if is_active is not None:
         query = query.filter(Watchlist.is_active == is_active)
     
-    return query.offset(skip).limit(limit).all()
+    return _keyset_page(query, Watchlist, response, skip, limit, cursor)
 
 @router.delete("/watchlist/{account_number}")
 async def remove_from_watchlist(
@@ -132,6 +178,7 @@ async def remove_from_watchlist(
     
     watchlist.is_active = False
     db.commit()
+    await remove_from_screening_set(WATCHLIST_KEY, account_number)
     
     return {"message": f"Account {account_number} removed from watchlist"}
 
@@ -141,44 +188,31 @@ async def add_exemption(
     db: Session = Depends(get_db)
 ):
     """
-    Add an account to transaction exemptions
+    Add an account to transaction exemptions, reactivating and updating an existing entry
     """
-    # Check if already exists
-    existing = db.query(TransactionExemption).filter(
-        TransactionExemption.account_number == exemption_data.account_number
-    ).first()
-    
-    if existing:
-        # Update existing entry
-        for key, value in exemption_data.model_dump(exclude_unset=True).items():
-            setattr(existing, key, value)
-        existing.is_active = True
-        db.commit()
-        db.refresh(existing)
-        return existing
-    
-    # Create new entry
-    exemption = TransactionExemption(**exemption_data.model_dump())
-    db.add(exemption)
-    db.commit()
-    db.refresh(exemption)
+    exemption = _upsert(
+        db, TransactionExemption, ['account_number'], exemption_data, EXEMPTION_COLUMNS
+    )
+    await add_to_screening_set(EXEMPTIONS_KEY, exemption.account_number)
     return exemption
 
 @router.get("/exemptions", response_model=List[TransactionExemptionResponse])
 async def get_exemptions(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[int] = None,
     is_active: Optional[bool] = True,
     db: Session = Depends(get_db)
 ):
     """
     Get all transaction exemptions
     """
-    query = db.query(TransactionExemption)
+    query = db.query(*EXEMPTION_COLUMNS)
     if is_active is not None:
         query = query.filter(TransactionExemption.is_active == is_active)
     
-    return query.offset(skip).limit(limit).all()
+    return _keyset_page(query, TransactionExemption, response, skip, limit, cursor)
 
 @router.delete("/exemptions/{account_number}")
 async def remove_exemption(
@@ -200,6 +234,7 @@ async def remove_exemption(
     
     exemption.is_active = False
     db.commit()
+    await remove_from_screening_set(EXEMPTIONS_KEY, account_number)
     
     return {"message": f"Account {account_number} exemption removed"}
 
@@ -211,27 +246,7 @@ async def create_transaction_limit(
     """
     Create or update a transaction limit
     """
-    # Check if limit exists for channel and type
-    existing = db.query(TransactionLimit).filter(
-        TransactionLimit.channel == limit_data.channel,
-        TransactionLimit.type == limit_data.type
-    ).first()
-    
-    if existing:
-        # Update existing limit
-        for key, value in limit_data.model_dump(exclude_unset=True).items():
-            setattr(existing, key, value)
-        existing.is_active = True
-        db.commit()
-        db.refresh(existing)
-        return existing
-    
-    # Create new limit
-    limit = TransactionLimit(**limit_data.model_dump())
-    db.add(limit)
-    db.commit()
-    db.refresh(limit)
-    return limit
+    return _upsert(db, TransactionLimit, ['channel', 'type'], limit_data, LIMIT_COLUMNS)
 
 @router.get("/limits", response_model=List[TransactionLimitResponse])
 async def get_transaction_limits(
@@ -243,7 +258,7 @@ async def get_transaction_limits(
     """
     Get transaction limits
     """
-    query = db.query(TransactionLimit)
+    query = db.query(*LIMIT_COLUMNS)
     
     if channel:
         query = query.filter(TransactionLimit.channel == channel)
@@ -287,7 +302,7 @@ async def get_suspicious_cases(
     """
     Get suspicious cases with optional filters
     """
-    query = db.query(SuspiciousCase)
+    query = db.query(*CASE_COLUMNS)
     
     if account_number:
         query = query.filter(SuspiciousCase.account_number == account_number)
@@ -344,26 +359,42 @@ async def update_case_status(
     
     return {"message": f"Case {case_number} status updated to {status.value}"}
 
+@lru_cache(maxsize=8)
+def _monitoring_status_body(monitoring_enabled: bool, ai_analysis_enabled: bool, external_sync_enabled: bool) -> bytes:
+    """The status payload only varies with the three flags; serialize each combination once"""
+    return orjson.dumps({
+        "monitoring_enabled": monitoring_enabled,
+        "ai_analysis_enabled": ai_analysis_enabled,
+        "external_sync_enabled": external_sync_enabled,
+        "webhook_endpoint": "/api/v1/webhook/suspicious"
+    })
+
 @router.get("/monitoring/status")
 async def get_monitoring_status():
     """
     Get current monitoring system status
     """
-    return {
-        "monitoring_enabled": settings.MONITORING_ENABLED,
-        "ai_analysis_enabled": settings.ENABLE_AI_ANALYSIS,
-        "external_sync_enabled": settings.ENABLE_EXTERNAL_SYNC,
-        "webhook_endpoint": "/api/v1/webhook/suspicious"
-    }
+    flags = await get_flags()
+    body = _monitoring_status_body(
+        flags["monitoring_enabled"], flags["ai_analysis_enabled"], flags["external_sync_enabled"]
+    )
+    return Response(content=body, media_type="application/json")
 
 @router.post("/monitoring/toggle")
 async def toggle_monitoring(enable: bool):
     """
-    Enable or disable transaction monitoring
-    Note: In production, this should update a persistent configuration
+    Enable or disable transaction monitoring for every worker
     """
-    settings.MONITORING_ENABLED = enable
+    try:
+        await set_flag("monitoring_enabled", enable)
+    except RedisError as e:
+        logger.error(f"Could not persist monitoring flag: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Could not update monitoring status"
+        )
+    
     return {
-        "monitoring_enabled": settings.MONITORING_ENABLED,
+        "monitoring_enabled": enable,
         "message": f"Transaction monitoring {'enabled' if enable else 'disabled'}"
     }
\ No newline at end of file
@@ -0,0 +1,107 @@
+from typing import Any, Awaitable, Callable, Optional
+from decimal import Decimal
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+import asyncio
+import logging
+import orjson
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_redis: Optional[aioredis.Redis] = None
+
+# How long a miss may hold the single-flight lock, and how often waiters re-check
+LOCK_TIMEOUT = 60
+LOCK_POLL_INTERVAL = 0.05
+
+# An unreachable Redis surfaces as a RedisError within seconds instead of a hang
+REDIS_CONNECT_TIMEOUT = 1
+REDIS_SOCKET_TIMEOUT = 2
+
+def get_redis() -> aioredis.Redis:
+    """Return the shared Redis client, creating it on first use"""
+    global _redis
+    if _redis is None:
+        _redis = aioredis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+            socket_timeout=REDIS_SOCKET_TIMEOUT
+        )
+    return _redis
+
+async def close_redis():
+    """Close the shared Redis client"""
+    global _redis
+    if _redis is not None:
+        await _redis.close()
+        _redis = None
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+def dumps(value: Any) -> bytes:
+    """Serialize a payload the same way it is cached"""
+    return orjson.dumps(value, default=_json_default)
+
+async def get_or_set(
+    key: str, ttl: int, loader: Callable[[], Awaitable[Any]], raw: bool = False
+) -> Any:
+    """
+    Return the cached payload for key, or await loader() and cache its result
+    for ttl seconds. Concurrent misses are single-flighted: the caller that
+    takes the lock:<key> lock runs the loader and the others wait for its
+    result instead of repeating the work. Redis errors fall through to the
+    loader so callers keep working without a cache.
+    
+    With raw=True the serialized bytes are returned instead: a hit hands back
+    what Redis stored untouched and a miss encodes the payload only once.
+    """
+    redis = get_redis()
+    lock_key = f"lock:{key}"
+    try:
+        cached = await redis.get(key)
+        if cached is not None:
+            return cached if raw else orjson.loads(cached)
+        
+        locked = await redis.set(lock_key, 1, nx=True, ex=LOCK_TIMEOUT)
+        # Someone else is computing it; wait until they publish or give up
+        while not locked:
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            cached = await redis.get(key)
+            if cached is not None:
+                return cached if raw else orjson.loads(cached)
+            locked = await redis.set(lock_key, 1, nx=True, ex=LOCK_TIMEOUT)
+    except RedisError as e:
+        logger.warning(f"Cache read failed for {key}: {str(e)}")
+        value = await loader()
+        return dumps(value) if raw else value
+    
+    try:
+        value = await loader()
+        body = dumps(value)
+        try:
+            await redis.set(key, body, ex=ttl)
+        except RedisError as e:
+            logger.warning(f"Cache write failed for {key}: {str(e)}")
+    finally:
+        try:
+            await redis.delete(lock_key)
+        except RedisError as e:
+            logger.warning(f"Could not release cache lock for {key}: {str(e)}")
+    
+    return body if raw else value
+
+async def invalidate(prefix: str) -> int:
+    """Delete every cached key starting with prefix; returns how many were removed"""
+    redis = get_redis()
+    removed = 0
+    try:
+        async for key in redis.scan_iter(match=f"{prefix}*", count=500):
+            removed += await redis.delete(key)
+    except RedisError as e:
+        logger.warning(f"Cache invalidation failed for {prefix}*: {str(e)}")
+    return removed
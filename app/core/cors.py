@@ -2,35 +2,39 @@
 CORS Configuration Module
 Handles Cross-Origin Resource Sharing settings for different environments
 """
-from typing import List
+from typing import Tuple
+from functools import lru_cache
+from starlette.middleware.cors import CORSMiddleware
 import os
 from app.core.config import settings
 
-def get_cors_origins() -> List[str]:
+# Default development origins
+DEV_ORIGINS = (
+    "http://localhost:3000",
+    "http://localhost:3001",
+    "http://localhost:3002",
+    "http://localhost:3003",
+    "http://127.0.0.1:3000",
+    "http://127.0.0.1:3001",
+    "http://127.0.0.1:3002",
+    "http://127.0.0.1:3003",
+    "http://localhost:8080",
+    "http://127.0.0.1:8080",
+    "http://102.23.120.243",
+    "http://102.23.120.243:3000",
+    "http://102.23.120.243:3001",
+    "http://102.23.120.243:8080",
+    "http://102.23.120.243:50000",
+    "https://102.23.120.243",
+)
+
+@lru_cache(maxsize=1)
+def get_cors_origins() -> Tuple[str, ...]:
     """
     Get CORS allowed origins based on environment
-    Returns a list of allowed origins
+    Returns a tuple of allowed origins, computed once per process
+    (call get_cors_origins.cache_clear() after changing the environment)
     """
-    # Default development origins
-    dev_origins = [
-        "http://localhost:3000",
-        "http://localhost:3001",
-        "http://localhost:3002",
-        "http://localhost:3003",
-        "http://127.0.0.1:3000",
-        "http://127.0.0.1:3001",
-        "http://127.0.0.1:3002",
-        "http://127.0.0.1:3003",
-        "http://localhost:8080",
-        "http://127.0.0.1:8080",
-        "http://102.23.120.243",
-        "http://102.23.120.243:3000",
-        "http://102.23.120.243:3001",
-        "http://102.23.120.243:8080",
-        "http://102.23.120.243:50000",
-        "https://102.23.120.243",
-    ]
-    
     # Production origins from environment variable
     prod_origins = []
     
@@ -48,39 +52,65 @@ def get_cors_origins() -> List[str]:
         elif isinstance(additional_origins, list):
             prod_origins.extend(additional_origins)
     
-    # Combine all origins
-    all_origins = list(set(dev_origins + prod_origins))
+    # Combine all origins, dropping duplicates but keeping their order
+    all_origins = tuple(dict.fromkeys(DEV_ORIGINS + tuple(prod_origins)))
     
     # In production, you might want to be more restrictive
     # Uncomment the following to only use production origins if specified
     # if prod_origins and os.getenv('ENVIRONMENT') == 'production':
-    #     return prod_origins
+    #     return tuple(prod_origins)
     
     return all_origins
 
+ALLOW_METHODS = ("GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH", "HEAD")
+
+ALLOW_HEADERS = (
+    "Accept",
+    "Accept-Language",
+    "Content-Type",
+    "Authorization",
+    "X-Requested-With",
+    "X-CSRF-Token",
+    "X-Request-ID",
+    "Cache-Control",
+    "Pragma",
+)
+
+EXPOSE_HEADERS = (
+    "Content-Disposition",
+    "Content-Length",
+    "X-Request-ID",
+    # Pagination cursors and cache validators read by the frontend
+    "X-Next-Cursor",
+    "X-Next-Before-Created-At",
+    "X-Next-Before-Id",
+    "ETag",
+)
+
+@lru_cache(maxsize=1)
 def get_cors_config():
     """
     Get complete CORS configuration
+    Built once and returned by reference; CORSMiddleware only reads it
+    when the middleware is instantiated
     """
     return {
-        "allow_origins": get_cors_origins(),
+        "allow_origins": list(get_cors_origins()),
         "allow_credentials": True,
-        "allow_methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH", "HEAD"],
-        "allow_headers": [
-            "Accept",
-            "Accept-Language",
-            "Content-Type",
-            "Authorization",
-            "X-Requested-With",
-            "X-CSRF-Token",
-            "X-Request-ID",
-            "Cache-Control",
-            "Pragma",
-        ],
-        "expose_headers": [
-            "Content-Disposition",
-            "Content-Length",
-            "X-Request-ID",
-        ],
+        "allow_methods": ALLOW_METHODS,
+        "allow_headers": ALLOW_HEADERS,
+        "expose_headers": EXPOSE_HEADERS,
         "max_age": 3600,  # Cache preflight requests for 1 hour
-    }
\ No newline at end of file
+    }
+
+class FastCORSMiddleware(CORSMiddleware):
+    """
+    CORSMiddleware with the origin allowlist held in a frozenset, so the
+    per-request `origin in allow_origins` check is a hash lookup instead
+    of a list scan. The "*" wildcard and allow_origin_regex paths are
+    unchanged.
+    """
+
+    def __init__(self, app, **kwargs):
+        super().__init__(app, **kwargs)
+        self.allow_origins = frozenset(self.allow_origins)
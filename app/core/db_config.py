@@ -0,0 +1,44 @@
+"""
+Database URL resolution
+Single loader for the connection URL, resolved once per process
+"""
+from functools import lru_cache
+from sqlalchemy.engine import URL, make_url
+import os
+from app.core.config import settings
+
+@lru_cache(maxsize=1)
+def get_database_url() -> str:
+    """
+    Resolve the database URL, first match wins:
+    1. DATABASE_URL
+    2. DB_HOST / DB_PORT / DB_USER / DB_PASSWORD / DB_NAME
+    3. the Settings default
+    
+    Only PostgreSQL is supported: the schema setup and the async engine
+    (asyncpg) depend on it, so any other backend is rejected here.
+    """
+    url = _resolve_database_url()
+    backend = make_url(url).get_backend_name()
+    if backend != "postgresql":
+        raise ValueError(
+            f"Unsupported database backend '{backend}': DATABASE_URL must be a PostgreSQL URL"
+        )
+    return url
+
+def _resolve_database_url() -> str:
+    env = os.environ
+    if env.get("DATABASE_URL"):
+        return env["DATABASE_URL"]
+    
+    if env.get("DB_HOST"):
+        return URL.create(
+            "postgresql",
+            username=env.get("DB_USER"),
+            password=env.get("DB_PASSWORD"),
+            host=env["DB_HOST"],
+            port=int(env.get("DB_PORT", "5432")),
+            database=env.get("DB_NAME", "aml_db"),
+        ).render_as_string(hide_password=False)
+    
+    return settings.DATABASE_URL
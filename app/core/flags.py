@@ -0,0 +1,64 @@
+from typing import Dict, Optional
+from cachetools import TTLCache
+from redis.exceptions import RedisError
+import logging
+
+from app.core.config import settings
+from app.core.cache import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Runtime feature flags shared by every worker through Redis; the settings
+# values are the defaults until a flag has been written
+FLAG_DEFAULTS = {
+    "monitoring_enabled": lambda: settings.MONITORING_ENABLED,
+    "ai_analysis_enabled": lambda: settings.ENABLE_AI_ANALYSIS,
+    "external_sync_enabled": lambda: settings.ENABLE_EXTERNAL_SYNC,
+}
+
+# Each worker re-reads the flags at most once a second
+_flags_cache: TTLCache = TTLCache(maxsize=1, ttl=1)
+
+# Last flags any get_flags() call saw, for callers that must not wait on Redis
+_last_flags: Optional[Dict[str, bool]] = None
+
+def _flag_key(name: str) -> str:
+    return f"flags:{name}"
+
+async def get_flags() -> Dict[str, bool]:
+    """Return every runtime flag, read from Redis with a single MGET"""
+    global _last_flags
+    flags = _flags_cache.get("flags")
+    if flags is not None:
+        return flags
+
+    names = list(FLAG_DEFAULTS)
+    try:
+        values = await get_redis().mget([_flag_key(name) for name in names])
+    except RedisError as e:
+        logger.warning(f"Could not read feature flags: {str(e)}")
+        values = [None] * len(names)
+
+    flags = {
+        name: FLAG_DEFAULTS[name]() if value is None else value == b"1"
+        for name, value in zip(names, values)
+    }
+    _flags_cache["flags"] = _last_flags = flags
+    return flags
+
+def get_cached_flags() -> Dict[str, bool]:
+    """
+    Return the flags from the last get_flags() call, or the settings
+    defaults before the first one, without touching Redis
+    """
+    if _last_flags is not None:
+        return _last_flags
+    return {name: default() for name, default in FLAG_DEFAULTS.items()}
+
+async def set_flag(name: str, enabled: bool):
+    """Persist a runtime flag for every worker"""
+    global _last_flags
+    await get_redis().set(_flag_key(name), b"1" if enabled else b"0")
+    _flags_cache.clear()
+    if _last_flags is not None:
+        _last_flags = {**_last_flags, name: enabled}
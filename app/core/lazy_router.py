@@ -0,0 +1,39 @@
+import importlib
+import logging
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+class LazyRouterMiddleware:
+    """
+    Import an endpoint module and include its router on the first request
+    under path_prefix (or for the OpenAPI schema), so workers that never
+    serve those routes never pay for the import.
+    """
+
+    def __init__(self, app: ASGIApp, module: str, path_prefix: str, **include_kwargs):
+        self.app = app
+        self.module = module
+        self.path_prefix = path_prefix
+        self.include_kwargs = include_kwargs
+        self.loaded = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if not self.loaded and scope["type"] == "http":
+            fastapi_app = scope["app"]
+            path = scope["path"]
+            if path.startswith(self.path_prefix) or path == fastapi_app.openapi_url:
+                self._load(fastapi_app)
+        await self.app(scope, receive, send)
+
+    def _load(self, fastapi_app):
+        try:
+            module = importlib.import_module(self.module)
+            fastapi_app.include_router(module.router, **self.include_kwargs)
+        except Exception as e:
+            # Left unloaded so the next matching request retries
+            logger.exception(f"Could not load {self.module}: {e}")
+            return
+        self.loaded = True
+        # Regenerate the schema with the new routes
+        fastapi_app.openapi_schema = None
@@ -0,0 +1,21 @@
+"""
+Logging Configuration Module
+Configures the root logger once per process
+"""
+import logging
+from app.core.config import settings
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Numeric level resolved once at import
+LOG_LEVEL = logging.getLevelName(settings.LOG_LEVEL.upper())
+
+def configure_logging():
+    """
+    Install the root handler unless one is already there, so re-imports
+    (uvicorn --reload, tests) do not stack duplicate handlers
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    logging.basicConfig(level=LOG_LEVEL, format=LOG_FORMAT)
@@ -0,0 +1,23 @@
+from datetime import datetime
+from fastapi import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+class RequestTimeMiddleware:
+    """
+    Stamp each request with a single wall-clock reading so every timestamp in
+    the response agrees. Naive local time, like the DateTime columns it is
+    compared against.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            scope.setdefault("state", {})["now"] = datetime.now()
+        await self.app(scope, receive, send)
+
+def get_request_time(request: Request) -> datetime:
+    """Dependency returning the time stamped on the current request"""
+    now = getattr(request.state, "now", None)
+    return now if now is not None else datetime.now()
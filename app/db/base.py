@@ -1,19 +1,49 @@
+from typing import Optional
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from app.core.postgres_config import DATABASE_URL
+from app.core.config import settings
+from app.core.db_config import get_database_url
 
-SQLALCHEMY_DATABASE_URL = DATABASE_URL
+SQLALCHEMY_DATABASE_URL = get_database_url()
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+def get_async_database_url(url: str) -> str:
+    """Swap the sync PostgreSQL driver for asyncpg, keeping everything else"""
+    return make_url(url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+# Sized for the workers' concurrency (tunable through DB_POOL_* settings);
+# recycle before PostgreSQL/PgBouncer idle timeouts
+POOL_OPTIONS = {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+    "pool_pre_ping": True,
+    # Compiled-SQL LRU shared by every statement shape the endpoints build
+    "query_cache_size": 1200,
+}
+
+# Server-side prepared statements are cached per asyncpg connection, so repeated
+# dashboard counts skip parse/plan after the first execution
+ASYNCPG_CONNECT_ARGS = {
+    "statement_cache_size": 1024,
+    "prepared_statement_cache_size": 512,
+}
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **POOL_OPTIONS)
+
+async_engine = create_async_engine(
+    get_async_database_url(SQLALCHEMY_DATABASE_URL),
+    connect_args=ASYNCPG_CONNECT_ARGS,
+    **POOL_OPTIONS
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -21,4 +51,17 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def run_isolated(statement, fetch: str = "all", params: Optional[dict] = None):
+    """
+    Run one statement on its own pooled connection and return
+    `result.<fetch>()`, so independent aggregates can be gathered
+    """
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(statement, params)
+        return getattr(result, fetch)()
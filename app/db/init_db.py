@@ -1,51 +1,517 @@
 """
 Database initialization script with proper enum handling
 """
-from sqlalchemy import text, inspect
-from sqlalchemy.exc import ProgrammingError
+from dataclasses import dataclass
+from typing import List
+from sqlalchemy import Enum as SQLEnum, Float, Numeric, create_engine, text, inspect
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
+from sqlalchemy.pool import NullPool
+from sqlalchemy.schema import CreateIndex
 from app.db.base import engine, Base, SQLALCHEMY_DATABASE_URL
+from app.models.user import UserRole
 from app.models import User, CustomerProfile, Watchlist, TransactionExemption, TransactionLimit
 import logging
+import random
+import time
 
 logger = logging.getLogger(__name__)
 
+@dataclass(frozen=True)
+class RetryConfig:
+    """Full-jitter exponential backoff for the startup database wait"""
+    max_attempts: int = 30
+    initial_delay: float = 0.1
+    max_delay: float = 10.0
+    multiplier: float = 2.0
+    use_jitter: bool = True
+
+    def delay(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.initial_delay * self.multiplier ** attempt)
+        return random.uniform(0, delay) if self.use_jitter else delay
+
+DB_STARTUP_RETRY = RetryConfig()
+
+# Composite indexes matching the audit endpoints' filter + ORDER BY created_at DESC
+AUDIT_INDEXES = {
+    'audit_user_created_idx': "audit_logs (user_id, created_at DESC, id DESC)",
+    'audit_resource_created_idx': "audit_logs (resource_type, resource_id, created_at DESC, id DESC)",
+    # Keyset pagination seeks on (created_at, id)
+    'audit_created_id_idx': "audit_logs (created_at DESC, id DESC)",
+    'audit_created_category_idx': "audit_logs (created_at DESC, category)",
+    'audit_created_action_idx': "audit_logs (created_at DESC, action)",
+    # Prefix matching for search terms too short for trigrams
+    'audit_username_prefix_idx': "audit_logs (username text_pattern_ops)",
+    'audit_resource_id_prefix_idx': "audit_logs (resource_id text_pattern_ops)",
+    # Trigram index so the substring search in get_audit_logs avoids a sequential scan
+    'audit_search_trgm_idx': "audit_logs USING gin (description gin_trgm_ops, username gin_trgm_ops, resource_id gin_trgm_ops)",
+}
+
+# Single-column indexes now covered by a composite index's leading column;
+# dropped once the model indexes on the table are all in place
+SUPERSEDED_INDEXES = {
+    'transactions': ['ix_transactions_account_number'],
+    'suspicious_cases': ['ix_suspicious_cases_account_number'],
+}
+
+INVALID_INDEXES_SQL = """
+    SELECT c.relname
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE NOT i.indisvalid AND n.nspname = current_schema()
+"""
+
+# Run before building a model's unique index on an existing table so duplicate
+# rows left from before the constraint existed do not fail the build; the
+# newest row of each group is kept
+UNIQUE_INDEX_DEDUPES = {
+    'uq_limit_channel_type': """
+        DELETE FROM transaction_limits older
+        USING transaction_limits newer
+        WHERE older.channel = newer.channel
+          AND older.type = newer.type
+          AND older.id < newer.id
+    """,
+}
+
+# Suspicious case rollup deltas for a transition table of cases
+_CASE_UPSERT = """
+    INSERT INTO suspicious_case_daily_rollup AS r (day, channel, status, case_count, total_amount)
+    SELECT COALESCE(created_at, now())::date, COALESCE(channel, ''), COALESCE(status::text, ''),
+           {sign} * count(*), {sign} * COALESCE(sum(amount), 0)
+    FROM {rows} GROUP BY 1, 2, 3
+    ON CONFLICT (day, channel, status) DO UPDATE
+    SET case_count = r.case_count + EXCLUDED.case_count,
+        total_amount = r.total_amount + EXCLUDED.total_amount;
+"""
+
+# Triggers from before the case rollup went through _install_rollup; they
+# reference differently named transition tables and would double count
+LEGACY_CASE_ROLLUP_TRIGGERS = (
+    'suspicious_cases_rollup_insert',
+    'suspicious_cases_rollup_update',
+    'suspicious_cases_rollup_delete',
+)
+
+_DASHBOARD_COLUMNS = (
+    "day, tx_count, tx_amount, suspicious_count, high_risk, "
+    "watchlist_hits, risk_score_sum, risk_score_count"
+)
+
+# Dashboard rollup deltas for a transition table of transactions / suspicious cases
+_DASHBOARD_TX_UPSERT = f"""
+    INSERT INTO dashboard_daily_stats AS d ({_DASHBOARD_COLUMNS})
+    SELECT COALESCE(created_at, now())::date, {{sign}} * count(*), {{sign}} * COALESCE(sum(amount), 0),
+           0, 0, 0, 0, 0
+    FROM {{rows}} GROUP BY 1
+    ON CONFLICT (day) DO UPDATE
+    SET tx_count = d.tx_count + EXCLUDED.tx_count,
+        tx_amount = d.tx_amount + EXCLUDED.tx_amount;
+"""
+
+_DASHBOARD_CASE_UPSERT = f"""
+    INSERT INTO dashboard_daily_stats AS d ({_DASHBOARD_COLUMNS})
+    SELECT COALESCE(created_at, now())::date, 0, 0,
+           {{sign}} * count(*),
+           {{sign}} * count(*) FILTER (WHERE risk_score >= 70),
+           {{sign}} * count(*) FILTER (WHERE is_watchlisted),
+           {{sign}} * COALESCE(sum(risk_score), 0),
+           {{sign}} * count(risk_score)
+    FROM {{rows}} GROUP BY 1
+    ON CONFLICT (day) DO UPDATE
+    SET suspicious_count = d.suspicious_count + EXCLUDED.suspicious_count,
+        high_risk = d.high_risk + EXCLUDED.high_risk,
+        watchlist_hits = d.watchlist_hits + EXCLUDED.watchlist_hits,
+        risk_score_sum = d.risk_score_sum + EXCLUDED.risk_score_sum,
+        risk_score_count = d.risk_score_count + EXCLUDED.risk_score_count;
+"""
+
+def _rollup_function(name: str, upsert: str) -> str:
+    return f"""
+CREATE OR REPLACE FUNCTION {name}() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        {upsert.format(sign=-1, rows='old_rows')}
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        {upsert.format(sign=1, rows='new_rows')}
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Source table -> (trigger function, its definition, backfill statement)
+CASE_ROLLUP_SOURCES = {
+    'suspicious_cases': (
+        'suspicious_case_rollup',
+        _rollup_function('suspicious_case_rollup', _CASE_UPSERT),
+        _CASE_UPSERT.format(sign=1, rows='suspicious_cases'),
+    ),
+}
+
+DASHBOARD_ROLLUP_SOURCES = {
+    'transactions': (
+        'dashboard_rollup_transactions',
+        _rollup_function('dashboard_rollup_transactions', _DASHBOARD_TX_UPSERT),
+        _DASHBOARD_TX_UPSERT.format(sign=1, rows='transactions'),
+    ),
+    'suspicious_cases': (
+        'dashboard_rollup_cases',
+        _rollup_function('dashboard_rollup_cases', _DASHBOARD_CASE_UPSERT),
+        _DASHBOARD_CASE_UPSERT.format(sign=1, rows='suspicious_cases'),
+    ),
+}
+
+# Geographic rollup deltas for a transition table of customer profiles;
+# NULL country/branch are stored as '' so they can be part of the key.
+# total_amount sums each profile's last transaction amount and
+# suspicious_count counts HIGH/CRITICAL profiles (RiskLevel names, as the
+# native enum stores them)
+_GEO_UPSERT = """
+    INSERT INTO geo_rollup AS g (country, branch, customer_count, risk_score_sum, risk_score_count,
+                                 total_amount, suspicious_count)
+    SELECT COALESCE(country, ''), COALESCE(branch, ''),
+           {sign} * count(*),
+           {sign} * COALESCE(sum(risk_score), 0),
+           {sign} * count(risk_score),
+           {sign} * COALESCE(sum(tran_amt), 0),
+           {sign} * count(*) FILTER (WHERE risk_level::text IN ('HIGH', 'CRITICAL'))
+    FROM {rows} GROUP BY 1, 2
+    ON CONFLICT (country, branch) DO UPDATE
+    SET customer_count = g.customer_count + EXCLUDED.customer_count,
+        risk_score_sum = g.risk_score_sum + EXCLUDED.risk_score_sum,
+        risk_score_count = g.risk_score_count + EXCLUDED.risk_score_count,
+        total_amount = g.total_amount + EXCLUDED.total_amount,
+        suspicious_count = g.suspicious_count + EXCLUDED.suspicious_count;
+"""
+
+GEO_ROLLUP_SOURCES = {
+    'customer_profiles': (
+        'geo_rollup_profiles',
+        _rollup_function('geo_rollup_profiles', _GEO_UPSERT),
+        _GEO_UPSERT.format(sign=1, rows='customer_profiles'),
+    ),
+}
+
+# Startup bookkeeping so restarts can skip DDL that has already been applied
+SCHEMA_META_DDL = """
+    CREATE TABLE IF NOT EXISTS schema_meta (
+        key text PRIMARY KEY,
+        value text NOT NULL
+    )
+"""
+ENUMS_MARKER = "enums_v2"
+
+# Columns added to existing models; create_all only creates missing tables.
+# Table -> column -> type and default as used in ALTER TABLE ... ADD COLUMN
+ADDED_COLUMNS = {
+    'users': {
+        'role': f"VARCHAR(50) NOT NULL DEFAULT '{UserRole.ANALYST.value}'",
+    },
+    'suspicious_cases': {
+        'risk_score': "DOUBLE PRECISION",
+        'is_watchlisted': "BOOLEAN DEFAULT false",
+        'channel': "VARCHAR(50)",
+    },
+}
+
+# Bump whenever a model, index, enum or rollup changes so the next start
+# reapplies the startup DDL; until then workers skip it entirely
+SCHEMA_VERSION = "8"
+SCHEMA_LOCK_ID = 42
+
+def _sql_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+# Native enum types exactly as the model columns declare them: type name -> labels
+ENUM_TYPES = {
+    column.type.name: tuple(column.type.enums)
+    for table in Base.metadata.sorted_tables
+    for column in table.columns
+    if isinstance(column.type, SQLEnum) and column.type.native_enum
+}
+
+# PostgreSQL has no CREATE TYPE IF NOT EXISTS; each type gets its own
+# sub-block so an existing one does not abort the rest. ADD VALUE IF NOT
+# EXISTS then brings a type created with an older label set up to date.
+CREATE_ENUMS_SQL = "DO $$ BEGIN\n" + "".join(
+    f"    BEGIN CREATE TYPE {name} AS ENUM ({', '.join(map(_sql_literal, labels))}); "
+    f"EXCEPTION WHEN duplicate_object THEN NULL; END;\n"
+    + "".join(f"    ALTER TYPE {name} ADD VALUE IF NOT EXISTS {_sql_literal(label)};\n" for label in labels)
+    for name, labels in ENUM_TYPES.items()
+) + "END $$"
+
+# Reset path: drop every table in the current schema server-side
+DROP_ALL_TABLES_SQL = """
+    DO $$
+    DECLARE
+        tables text;
+    BEGIN
+        SELECT string_agg(format('%I', tablename), ', ') INTO tables
+        FROM pg_tables WHERE schemaname = current_schema();
+        IF tables IS NOT NULL THEN
+            EXECUTE 'DROP TABLE IF EXISTS ' || tables || ' CASCADE';
+        END IF;
+    END $$
+"""
+
+# Statement triggers installed on every rollup source table
+ROLLUP_TRIGGERS = {
+    'insert': "AFTER INSERT ON {table} REFERENCING NEW TABLE AS new_rows",
+    'update': "AFTER UPDATE ON {table} REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    'delete': "AFTER DELETE ON {table} REFERENCING OLD TABLE AS old_rows",
+}
+
+def wait_for_database(retry: RetryConfig = DB_STARTUP_RETRY):
+    """
+    Block until the database accepts connections. Workers back off with
+    jitter so a rolling restart does not reconnect in lockstep.
+    """
+    # Unpooled probe: no pre-ping on top of the SELECT 1, and a short
+    # connect timeout so an unreachable host fails fast into the backoff
+    probe = create_engine(SQLALCHEMY_DATABASE_URL, poolclass=NullPool, connect_args={"connect_timeout": 3})
+    try:
+        for attempt in range(retry.max_attempts):
+            try:
+                with probe.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                return
+            except OperationalError as e:
+                if attempt == retry.max_attempts - 1:
+                    raise
+                delay = retry.delay(attempt)
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"Database not ready (attempt {attempt + 1}/{retry.max_attempts}), retrying in {delay:.2f}s: {e}")
+                time.sleep(delay)
+    finally:
+        probe.dispose()
+
+def _has_marker(conn, key: str) -> bool:
+    return conn.execute(
+        text("SELECT 1 FROM schema_meta WHERE key = :key"), {"key": key}
+    ).first() is not None
+
+def _set_marker(conn, key: str, value: str = "done"):
+    conn.execute(
+        text(
+            "INSERT INTO schema_meta (key, value) VALUES (:key, :value) "
+            "ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value"
+        ),
+        {"key": key, "value": value}
+    )
+
 def check_and_create_enums():
     """Check if enum types exist and create them if needed"""
-    # Skip enum creation for SQLite
-    if "sqlite" in SQLALCHEMY_DATABASE_URL.lower():
-        logger.info("Using SQLite - skipping enum creation")
-        return
-    
     with engine.connect() as conn:
-        # Check existing enum types
-        result = conn.execute(text("""
-            SELECT typname 
-            FROM pg_type 
-            WHERE typtype = 'e'
-        """))
-        existing_enums = {row[0] for row in result}
+        conn.execute(text(SCHEMA_META_DDL))
+        conn.commit()
+        # Restarts skip the pg_type probe once the enums have been created
+        if _has_marker(conn, ENUMS_MARKER):
+            return
         
-        # Define required enums
-        enums_to_create = {
-            'transactionstatus': "('pending', 'completed', 'failed', 'cancelled')",
-            'riskrating': "('low', 'medium', 'high', 'critical')",
-            'casestatus': "('open', 'investigating', 'resolved', 'closed')",
-            'limittype': "('daily', 'weekly', 'monthly')"
-        }
+        # One round-trip creates whichever enum types are missing
+        conn.execute(text(CREATE_ENUMS_SQL))
+        _set_marker(conn, ENUMS_MARKER)
+        conn.commit()
+
+def create_audit_indexes() -> List[str]:
+    """
+    Create the audit log indexes without blocking concurrent writes,
+    returning the names of any that could not be created
+    """
+    if not inspect(engine).has_table("audit_logs"):
+        logger.info("audit_logs table not found - skipping audit indexes")
+        return []
+    
+    failed = []
+    
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        try:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        except ProgrammingError as e:
+            logger.warning(f"Could not enable pg_trgm extension: {e}")
+        
+        for index_name, index_definition in AUDIT_INDEXES.items():
+            try:
+                conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {index_definition}"))
+            except ProgrammingError as e:
+                failed.append(index_name)
+                logger.warning(f"Could not create index {index_name}: {e}")
+    
+    return failed
+
+def _create_index_concurrently(index) -> str:
+    """CREATE INDEX CONCURRENTLY IF NOT EXISTS for a model index, leaving the model's own DDL untouched"""
+    ddl = CreateIndex(index, if_not_exists=True)
+    index.dialect_kwargs['postgresql_concurrently'] = True
+    try:
+        return str(ddl.compile(dialect=engine.dialect))
+    finally:
+        index.dialect_kwargs['postgresql_concurrently'] = False
+
+def create_model_indexes() -> List[str]:
+    """
+    Create indexes declared on the models that create_all skipped because
+    their table already existed, then VACUUM ANALYZE those tables so the
+    visibility map allows index-only scans straight away. Returns the names
+    of the indexes that could not be created.
+    """
+    inspector = inspect(engine)
+    failed_indexes = []
+    # CREATE INDEX CONCURRENTLY and VACUUM cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        # Left behind by an interrupted concurrent build; these must be rebuilt
+        invalid = {row[0] for row in conn.execute(text(INVALID_INDEXES_SQL))}
         
-        # Create missing enums
-        for enum_name, enum_values in enums_to_create.items():
-            if enum_name not in existing_enums:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            
+            existing = {index['name'] for index in inspector.get_indexes(table.name)}
+            created = False
+            failed = False
+            for index in table.indexes:
+                if index.name in existing and index.name not in invalid:
+                    continue
                 try:
-                    conn.execute(text(f"CREATE TYPE {enum_name} AS ENUM {enum_values}"))
-                    conn.commit()
-                    logger.info(f"Created enum type: {enum_name}")
-                except ProgrammingError as e:
-                    logger.warning(f"Enum {enum_name} might already exist: {e}")
-                    conn.rollback()
+                    if index.name in invalid:
+                        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index.name}"))
+                        logger.info(f"Dropped invalid index {index.name} for rebuild")
+                    if index.name in UNIQUE_INDEX_DEDUPES:
+                        removed = conn.execute(text(UNIQUE_INDEX_DEDUPES[index.name])).rowcount
+                        if removed:
+                            logger.warning(f"Removed {removed} duplicate rows from {table.name} before building {index.name}")
+                    conn.execute(text(_create_index_concurrently(index)))
+                    created = True
+                    logger.info(f"Created index {index.name}")
+                except (ProgrammingError, IntegrityError) as e:
+                    # A failed concurrent build leaves an INVALID index behind under this name
+                    conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index.name}"))
+                    # Upserts use unique indexes as their ON CONFLICT target; without one they all fail
+                    if index.unique:
+                        raise RuntimeError(f"Could not create unique index {index.name}: {e}") from e
+                    failed = True
+                    failed_indexes.append(index.name)
+                    logger.warning(f"Could not create index {index.name}: {e}")
+            
+            if not failed:
+                for index_name in SUPERSEDED_INDEXES.get(table.name, []):
+                    if index_name in existing:
+                        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+                        logger.info(f"Dropped superseded index {index_name}")
+            
+            if created:
+                conn.execute(text(f"VACUUM ANALYZE {table.name}"))
+    
+    return failed_indexes
 
-def init_db():
-    """Initialize database with proper error handling"""
+def add_missing_columns():
+    """Add columns the models gained after their table was first created"""
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        for table_name, columns in ADDED_COLUMNS.items():
+            existing = {column['name'] for column in inspector.get_columns(table_name)}
+            for column_name, definition in columns.items():
+                if column_name not in existing:
+                    conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {definition}"))
+                    logger.info(f"Added {table_name}.{column_name} column")
+
+def convert_money_columns():
+    """
+    Retype columns the models now declare as NUMERIC but an existing database
+    still holds as double precision, one ALTER TABLE (one rewrite) per table
+    """
+    with engine.begin() as conn:
+        floating = {
+            (table_name, column_name) for table_name, column_name in conn.execute(text("""
+                SELECT table_name, column_name
+                FROM information_schema.columns
+                WHERE table_schema = current_schema() AND data_type = 'double precision'
+            """))
+        }
+        for table in Base.metadata.sorted_tables:
+            clauses = [
+                f"ALTER COLUMN {column.name} TYPE {column.type.compile(dialect=engine.dialect)}"
+                for column in table.columns
+                if isinstance(column.type, Numeric) and not isinstance(column.type, Float)
+                and (table.name, column.name) in floating
+            ]
+            if clauses:
+                conn.execute(text(f"ALTER TABLE {table.name} " + ", ".join(clauses)))
+                logger.info(f"Converted {len(clauses)} money columns on {table.name} to NUMERIC")
+
+def _install_rollup(name: str, rollup_table: str, sources: dict):
+    """
+    Install the statement triggers that keep rollup_table current from each
+    source table, backfilling the rollup when any trigger is missing
+    """
+    with engine.begin() as conn:
+        for _, function_sql, _ in sources.values():
+            conn.execute(text(function_sql))
+        
+        installed = {
+            row[0] for row in conn.execute(
+                text("SELECT tgname FROM pg_trigger WHERE tgrelid = ANY(CAST(:tables AS regclass[]))"),
+                {"tables": list(sources)}
+            )
+        }
+        triggers = [
+            (f"{table_name}_{name}_{op}", table_name, definition.format(table=table_name))
+            for table_name in sources
+            for op, definition in ROLLUP_TRIGGERS.items()
+        ]
+        if all(trigger_name in installed for trigger_name, _, _ in triggers):
+            return
+        
+        # Hold off writers so the backfill and the triggers see the same rows
+        conn.execute(text(f"LOCK TABLE {', '.join(sources)} IN SHARE ROW EXCLUSIVE MODE"))
+        conn.execute(text(f"DELETE FROM {rollup_table}"))
+        for _, _, backfill in sources.values():
+            conn.execute(text(backfill))
+        for trigger_name, table_name, definition in triggers:
+            function_name = sources[table_name][0]
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger_name} ON {table_name}"))
+            conn.execute(text(
+                f"CREATE TRIGGER {trigger_name} {definition} "
+                f"FOR EACH STATEMENT EXECUTE FUNCTION {function_name}()"
+            ))
+        logger.info(f"Installed {name} rollup triggers")
+
+def create_rollups():
+    """Install the case, dashboard and geo rollup triggers, backfilling each rollup on first install"""
+    # Statements that must run before a rollup's triggers are (re)installed
+    rollups = (
+        ("case", "suspicious_case_daily_rollup", CASE_ROLLUP_SOURCES,
+         [f"DROP TRIGGER IF EXISTS {name} ON suspicious_cases" for name in LEGACY_CASE_ROLLUP_TRIGGERS]),
+        # Superseded by the trigger-maintained table
+        ("dashboard", "dashboard_daily_stats", DASHBOARD_ROLLUP_SOURCES,
+         ["DROP MATERIALIZED VIEW IF EXISTS mv_dashboard_daily_stats"]),
+        ("geo", "geo_rollup", GEO_ROLLUP_SOURCES, []),
+    )
+    failed = []
+    for name, rollup_table, sources, cleanup in rollups:
+        try:
+            if cleanup:
+                with engine.begin() as conn:
+                    for statement in cleanup:
+                        conn.execute(text(statement))
+            _install_rollup(name, rollup_table, sources)
+        except ProgrammingError as e:
+            failed.append(name)
+            logger.error(f"Could not install {name} rollup: {e}")
+    
+    # The endpoints read these tables directly; an empty rollup would serve zeros
+    if failed:
+        raise RuntimeError(f"Could not install rollups: {', '.join(failed)}")
+
+def _apply_schema() -> List[str]:
+    """
+    Create enums, tables, indexes and rollups, resetting the schema if
+    create_all fails. Returns the indexes that could not be built; a rollup
+    that cannot be installed raises.
+    """
     try:
         # First check and create enum types if needed
         check_and_create_enums()
@@ -59,12 +525,9 @@ def init_db():
         # Try alternative approach - drop and recreate
         try:
             logger.info("Attempting to reset database schema...")
-            with engine.connect() as conn:
-                # Drop all tables
-                inspector = inspect(engine)
-                for table_name in inspector.get_table_names():
-                    conn.execute(text(f"DROP TABLE IF EXISTS {table_name} CASCADE"))
-                conn.commit()
+            # Drop all tables in one round-trip and one transaction
+            with engine.begin() as conn:
+                conn.execute(text(DROP_ALL_TABLES_SQL))
                 
             # Recreate enums and tables
             check_and_create_enums()
@@ -74,6 +537,51 @@ def init_db():
         except Exception as reset_error:
             logger.error(f"Failed to reset database: {reset_error}")
             raise
+    
+    add_missing_columns()
+    convert_money_columns()
+    failed = create_model_indexes() + create_audit_indexes()
+    create_rollups()
+    return failed
+
+def init_db():
+    """
+    Bring the schema up to SCHEMA_VERSION. Workers take an advisory lock in
+    turn; the first one applies the DDL and records the version, the rest
+    find it recorded and skip straight past it.
+    """
+    wait_for_database()
+    
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": SCHEMA_LOCK_ID})
+        try:
+            conn.execute(text(SCHEMA_META_DDL))
+            conn.commit()
+            current = conn.execute(
+                text("SELECT value FROM schema_meta WHERE key = 'schema_version'")
+            ).scalar()
+            conn.commit()
+            if current == SCHEMA_VERSION:
+                logger.info(f"Database schema already at version {SCHEMA_VERSION}")
+                return
+            
+            failed = _apply_schema()
+            if failed:
+                # Leave the version unrecorded so the next start retries the DDL
+                logger.error(
+                    f"Database schema not marked as version {SCHEMA_VERSION}; "
+                    f"could not create: {', '.join(failed)}"
+                )
+                return
+            
+            # A schema reset drops schema_meta along with everything else
+            conn.execute(text(SCHEMA_META_DDL))
+            _set_marker(conn, "schema_version", SCHEMA_VERSION)
+            conn.commit()
+            logger.info(f"Database schema updated to version {SCHEMA_VERSION}")
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": SCHEMA_LOCK_ID})
+            conn.commit()
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
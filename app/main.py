@@ -1,17 +1,24 @@
 from fastapi import FastAPI, Request, Response
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
 import logging
+import os
+import orjson
 
 from app.core.config import settings
 from app.api.endpoints import transaction_monitoring, simple_statistics, auth
-from app.db.base import engine, Base
+from app.db.base import engine, async_engine, Base
+from app.services.audit_writer import audit_writer
+from app.services.screening_cache import load_screening_sets
+from app.core.cache import close_redis
+from app.core.cors import FastCORSMiddleware, get_cors_config
+from app.core.request_time import RequestTimeMiddleware
+from app.core.lazy_router import LazyRouterMiddleware
+from app.core.flags import get_cached_flags
+from app.core.logging import configure_logging
 
 # Configure logging
-logging.basicConfig(
-    level=getattr(logging, settings.LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 @asynccontextmanager
@@ -27,26 +34,36 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Database initialization error: {e}")
         # Continue anyway - some endpoints might still work
+    audit_writer.start()
+    await load_screening_sets()
     yield
     # Shutdown
     logger.info("Shutting down...")
+    await audit_writer.stop()
+    await close_redis()
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# SUPER SIMPLE CORS - Allow everything
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins
-    allow_credentials=True,
-    allow_methods=["*"],  # Allow all methods
-    allow_headers=["*"],  # Allow all headers
-    expose_headers=["*"],  # Expose all headers
-)
+# Allow everything unless CORS_ALLOWED_ORIGINS opts into an explicit allowlist
+if os.getenv("CORS_ALLOWED_ORIGINS"):
+    app.add_middleware(FastCORSMiddleware, **get_cors_config())
+else:
+    app.add_middleware(
+        FastCORSMiddleware,
+        allow_origins=["*"],  # Allow all origins
+        allow_credentials=True,
+        allow_methods=["*"],  # Allow all methods
+        allow_headers=["*"],  # Allow all headers
+        expose_headers=["*"],  # Expose all headers
+    )
+
+app.add_middleware(RequestTimeMiddleware)
 
 # Include routers
 app.include_router(
@@ -61,16 +78,14 @@ app.include_router(
     tags=["simple-statistics"]
 )
 
-# Try to include statistics if it exists
-try:
-    from app.api.endpoints import statistics
-    app.include_router(
-        statistics.router,
-        prefix=settings.API_V1_PREFIX,
-        tags=["statistics"]
-    )
-except ImportError:
-    pass
+# Statistics is imported on its first request instead of at startup
+app.add_middleware(
+    LazyRouterMiddleware,
+    module="app.api.endpoints.statistics",
+    path_prefix=f"{settings.API_V1_PREFIX}/statistics",
+    prefix=settings.API_V1_PREFIX,
+    tags=["statistics"]
+)
 
 app.include_router(
     auth.router,
@@ -78,26 +93,53 @@ app.include_router(
     tags=["authentication"]
 )
 
-@app.get("/")
-async def root():
-    return {
+# The only moving part of these payloads is the monitoring flag, so both
+# variants are serialized once up front. The flag comes from the last value
+# this worker read, so liveness probes never wait on Redis
+_ROOT_BYTES = {
+    enabled: orjson.dumps({
         "message": "AML Transaction Monitoring System",
         "version": settings.APP_VERSION,
-        "monitoring_enabled": settings.MONITORING_ENABLED
-    }
+        "monitoring_enabled": enabled
+    })
+    for enabled in (True, False)
+}
 
-@app.get("/health")
-async def health_check():
-    return {
+_HEALTH_BYTES = {
+    enabled: orjson.dumps({
         "status": "healthy",
-        "monitoring_enabled": settings.MONITORING_ENABLED,
+        "monitoring_enabled": enabled,
         "database": "connected"
-    }
+    })
+    for enabled in (True, False)
+}
+
+@app.get("/")
+async def root():
+    monitoring_enabled = get_cached_flags()["monitoring_enabled"]
+    return Response(content=_ROOT_BYTES[monitoring_enabled], media_type="application/json")
+
+@app.get("/health")
+async def health_check():
+    monitoring_enabled = get_cached_flags()["monitoring_enabled"]
+    return Response(content=_HEALTH_BYTES[monitoring_enabled], media_type="application/json")
 
 @app.get(f"{settings.API_V1_PREFIX}/health")
 async def api_health_check():
-    return {
-        "status": "healthy",
-        "monitoring_enabled": settings.MONITORING_ENABLED,
-        "database": "connected"
-    }
\ No newline at end of file
+    monitoring_enabled = get_cached_flags()["monitoring_enabled"]
+    return Response(content=_HEALTH_BYTES[monitoring_enabled], media_type="application/json")
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Connection pool gauges in Prometheus text format"""
+    lines = []
+    for name, pool in (("sync", engine.pool), ("async", async_engine.pool)):
+        for metric, value in (
+            ("size", pool.size()),
+            ("checked_in", pool.checkedin()),
+            ("checked_out", pool.checkedout()),
+            ("overflow", pool.overflow()),
+        ):
+            lines.append(f'db_pool_{metric}{{engine="{name}"}} {value}')
+    return "\n".join(lines) + "\n"
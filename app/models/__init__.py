@@ -5,6 +5,9 @@ from app.models.user import User
 from app.models.transaction import (
     Transaction, 
     SuspiciousCase,
+    SuspiciousCaseDailyRollup,
+    DashboardDailyStats,
+    GeoRollup,
     CustomerProfile,
     Watchlist,
     TransactionExemption,
@@ -29,6 +32,9 @@ __all__ = [
     'Exemption',
     'TransactionLimit',
     'SuspiciousCase',
+    'SuspiciousCaseDailyRollup',
+    'DashboardDailyStats',
+    'GeoRollup',
     'RawTransaction',
     'customer_profile',
     'watchlist',
@@ -1,9 +1,13 @@
-from sqlalchemy import Column, String, Float, DateTime, Integer, Text, JSON, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, String, Float, Numeric, Date, DateTime, Integer, BigInteger, Text, JSON, Boolean, Index, Enum as SQLEnum
 from sqlalchemy.sql import func
 from app.db.base import Base
 from datetime import datetime
 import enum
 
+# Currency amounts: exact NUMERIC storage and aggregation in PostgreSQL, plain
+# floats on the Python side like the rest of the schemas expect
+Money = Numeric(18, 2, asdecimal=False)
+
 class RiskLevel(str, enum.Enum):
     LOW = "low"
     MEDIUM = "medium"
@@ -22,7 +26,7 @@ class SuspiciousCase(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     case_number = Column(String(24), unique=True, index=True, nullable=False)
-    account_number = Column(String(50), index=True, nullable=False)
+    account_number = Column(String(50), nullable=False)
     account_name = Column(String(255), nullable=False)
     account_open_date = Column(DateTime)
     transaction_date = Column(DateTime, nullable=False)
@@ -33,11 +37,14 @@ class SuspiciousCase(Base):
     transaction_id = Column(String(100), unique=True, index=True)
     currency = Column(String(10))
     transaction_type = Column(String(20))
-    amount = Column(Float, nullable=False)
+    channel = Column(String(50))
+    amount = Column(Money, nullable=False)
     reference = Column(Text)
     tpin_number = Column(String(50))
     status = Column(SQLEnum(TransactionStatus), default=TransactionStatus.SUSPICIOUS)
     flagging_reason = Column(Text)
+    risk_score = Column(Float)
+    is_watchlisted = Column(Boolean, default=False)
     sanction_category = Column(String(100))
     sanction_data = Column(JSON)
     watchlist_category = Column(String(100))
@@ -51,13 +58,56 @@ class SuspiciousCase(Base):
     value_date = Column(DateTime)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
+    
+    __table_args__ = (
+        # Covers the date-window report and compliance aggregates without touching the heap
+        Index(
+            'ix_suspcase_created_status',
+            'created_at', 'status',
+            postgresql_include=['compliance_category', 'amount', 'updated_at']
+        ),
+        # Per-account case lookups: equality on the account, then the created_at
+        # window / newest-first order (replaces the single-column account index)
+        Index('ix_suspcase_acct_created', 'account_number', 'created_at'),
+    )
+
+class SuspiciousCaseDailyRollup(Base):
+    """
+    Per day/channel/status case counts and amounts, kept current by statement
+    triggers on suspicious_cases (see app.db.init_db.create_rollups).
+    NULL channel/status are stored as '' so they can be part of the key.
+    """
+    __tablename__ = "suspicious_case_daily_rollup"
+    
+    day = Column(Date, primary_key=True)
+    channel = Column(String(50), primary_key=True, default='')
+    status = Column(String(50), primary_key=True, default='')
+    case_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Money, nullable=False, default=0)
+
+class DashboardDailyStats(Base):
+    """
+    Per-day dashboard aggregates over transactions and suspicious_cases, kept
+    current by statement triggers on both tables (see
+    app.db.init_db.create_rollups).
+    """
+    __tablename__ = "dashboard_daily_stats"
+    
+    day = Column(Date, primary_key=True)
+    tx_count = Column(BigInteger, nullable=False, default=0)
+    tx_amount = Column(Money, nullable=False, default=0)
+    suspicious_count = Column(Integer, nullable=False, default=0)
+    high_risk = Column(Integer, nullable=False, default=0)
+    watchlist_hits = Column(Integer, nullable=False, default=0)
+    risk_score_sum = Column(Float, nullable=False, default=0)
+    risk_score_count = Column(Integer, nullable=False, default=0)
 
 class Transaction(Base):
     __tablename__ = "transactions"
     
     id = Column(Integer, primary_key=True, index=True)
     case_number = Column(String(24), index=True, nullable=False)
-    account_number = Column(String(50), index=True, nullable=False)
+    account_number = Column(String(50), nullable=False)
     account_name = Column(String(255), nullable=False)
     account_open_date = Column(DateTime)
     transaction_date = Column(DateTime, nullable=False)
@@ -68,7 +118,7 @@ class Transaction(Base):
     transaction_id = Column(String(100), unique=True, index=True)
     currency = Column(String(10))
     transaction_type = Column(String(20))
-    amount = Column(Float, nullable=False)
+    amount = Column(Money, nullable=False)
     reference = Column(Text)
     tpin_number = Column(String(50))
     status = Column(SQLEnum(TransactionStatus), default=TransactionStatus.PENDING)
@@ -85,6 +135,28 @@ class Transaction(Base):
     value_date = Column(DateTime)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
+    
+    __table_args__ = (
+        # Append-only table: a BRIN index keeps created_at range scans cheap at a fraction of a B-tree's size
+        Index(
+            'ix_tx_created',
+            'created_at',
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 32}
+        ),
+        # Index-only scans for the volume statistics (count/sum of amount per window)
+        Index(
+            'ix_tx_created_amount',
+            'created_at',
+            postgresql_include=['amount']
+        ),
+        # Account history by date as an index-only scan (replaces the single-column account index)
+        Index(
+            'ix_tx_acct_date_amt',
+            'account_number', 'transaction_date',
+            postgresql_include=['amount', 'status']
+        ),
+    )
 
 class CustomerProfile(Base):
     __tablename__ = "customer_profiles"
@@ -108,33 +180,38 @@ class CustomerProfile(Base):
     tran_date = Column(DateTime)
     tran_crncy_code = Column(String(10))
     dr_cr_indicator = Column(String(10))
-    tran_amt = Column(Float)
+    tran_amt = Column(Money)
     tran_particular = Column(Text)
     tran_rmks = Column(Text)
     
     # Transaction limits
-    a_cash_excp_amt_lim = Column(Float, default=0)
-    a_clg_excp_amt_lim = Column(Float, default=0)
-    a_xfer_excp_amt_lim = Column(Float, default=0)
-    a_cash_cr_excp_amt_lim = Column(Float, default=0)
-    a_clg_cr_excp_amt_lim = Column(Float, default=0)
-    a_xfer_cr_excp_amt_lim = Column(Float, default=0)
-    s_cash_abnrml_amt_lim = Column(Float, default=0)
-    s_clg_abnrml_amt_lim = Column(Float, default=0)
-    s_xfer_abnrml_amt_lim = Column(Float, default=0)
-    s_cash_dr_lim = Column(Float, default=0)
-    s_xfer_dr_lim = Column(Float, default=0)
-    s_clg_dr_lim = Column(Float, default=0)
-    s_cash_cr_lim = Column(Float, default=0)
-    s_xfer_cr_lim = Column(Float, default=0)
-    s_clg_cr_lim = Column(Float, default=0)
-    s_cash_dr_abnrml_lim = Column(Float, default=0)
-    s_clg_dr_abnrml_lim = Column(Float, default=0)
-    s_xfer_dr_abnrml_lim = Column(Float, default=0)
-    s_new_acct_abnrml_tran_amt = Column(Float, default=0)
+    a_cash_excp_amt_lim = Column(Money, default=0)
+    a_clg_excp_amt_lim = Column(Money, default=0)
+    a_xfer_excp_amt_lim = Column(Money, default=0)
+    a_cash_cr_excp_amt_lim = Column(Money, default=0)
+    a_clg_cr_excp_amt_lim = Column(Money, default=0)
+    a_xfer_cr_excp_amt_lim = Column(Money, default=0)
+    s_cash_abnrml_amt_lim = Column(Money, default=0)
+    s_clg_abnrml_amt_lim = Column(Money, default=0)
+    s_xfer_abnrml_amt_lim = Column(Money, default=0)
+    s_cash_dr_lim = Column(Money, default=0)
+    s_xfer_dr_lim = Column(Money, default=0)
+    s_clg_dr_lim = Column(Money, default=0)
+    s_cash_cr_lim = Column(Money, default=0)
+    s_xfer_cr_lim = Column(Money, default=0)
+    s_clg_cr_lim = Column(Money, default=0)
+    s_cash_dr_abnrml_lim = Column(Money, default=0)
+    s_clg_dr_abnrml_lim = Column(Money, default=0)
+    s_xfer_dr_abnrml_lim = Column(Money, default=0)
+    s_new_acct_abnrml_tran_amt = Column(Money, default=0)
     
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
+    
+    __table_args__ = (
+        Index('ix_profile_risk', 'risk_score'),
+        Index('ix_profile_country', 'country'),
+    )
 
 class RawTransaction(Base):
     __tablename__ = "raw_transactions"
@@ -158,30 +235,30 @@ class RawTransaction(Base):
     tran_date = Column(DateTime)
     tran_crncy_code = Column(String(10))
     dr_cr_indicator = Column(String(10))
-    tran_amt = Column(Float)
+    tran_amt = Column(Money)
     tran_particular = Column(Text)
     tran_rmks = Column(Text)
     
     # Transaction limits
-    a_cash_excp_amt_lim = Column(Float, default=0)
-    a_clg_excp_amt_lim = Column(Float, default=0)
-    a_xfer_excp_amt_lim = Column(Float, default=0)
-    a_cash_cr_excp_amt_lim = Column(Float, default=0)
-    a_clg_cr_excp_amt_lim = Column(Float, default=0)
-    a_xfer_cr_excp_amt_lim = Column(Float, default=0)
-    s_cash_abnrml_amt_lim = Column(Float, default=0)
-    s_clg_abnrml_amt_lim = Column(Float, default=0)
-    s_xfer_abnrml_amt_lim = Column(Float, default=0)
-    s_cash_dr_lim = Column(Float, default=0)
-    s_xfer_dr_lim = Column(Float, default=0)
-    s_clg_dr_lim = Column(Float, default=0)
-    s_cash_cr_lim = Column(Float, default=0)
-    s_xfer_cr_lim = Column(Float, default=0)
-    s_clg_cr_lim = Column(Float, default=0)
-    s_cash_dr_abnrml_lim = Column(Float, default=0)
-    s_clg_dr_abnrml_lim = Column(Float, default=0)
-    s_xfer_dr_abnrml_lim = Column(Float, default=0)
-    s_new_acct_abnrml_tran_amt = Column(Float, default=0)
+    a_cash_excp_amt_lim = Column(Money, default=0)
+    a_clg_excp_amt_lim = Column(Money, default=0)
+    a_xfer_excp_amt_lim = Column(Money, default=0)
+    a_cash_cr_excp_amt_lim = Column(Money, default=0)
+    a_clg_cr_excp_amt_lim = Column(Money, default=0)
+    a_xfer_cr_excp_amt_lim = Column(Money, default=0)
+    s_cash_abnrml_amt_lim = Column(Money, default=0)
+    s_clg_abnrml_amt_lim = Column(Money, default=0)
+    s_xfer_abnrml_amt_lim = Column(Money, default=0)
+    s_cash_dr_lim = Column(Money, default=0)
+    s_xfer_dr_lim = Column(Money, default=0)
+    s_clg_dr_lim = Column(Money, default=0)
+    s_cash_cr_lim = Column(Money, default=0)
+    s_xfer_cr_lim = Column(Money, default=0)
+    s_clg_cr_lim = Column(Money, default=0)
+    s_cash_dr_abnrml_lim = Column(Money, default=0)
+    s_clg_dr_abnrml_lim = Column(Money, default=0)
+    s_xfer_dr_abnrml_lim = Column(Money, default=0)
+    s_new_acct_abnrml_tran_amt = Column(Money, default=0)
     
     photo = Column(Text)
     cif_id = Column(String(50))
@@ -191,6 +268,23 @@ class RawTransaction(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
 
+class GeoRollup(Base):
+    """
+    Customer profile counts and totals per country/branch, kept current by
+    statement triggers on customer_profiles (see
+    app.db.init_db.create_rollups). NULL country/branch are stored as ''
+    so they can be part of the key.
+    """
+    __tablename__ = "geo_rollup"
+    
+    country = Column(String(100), primary_key=True, default='')
+    branch = Column(String(50), primary_key=True, default='')
+    customer_count = Column(Integer, nullable=False, default=0)
+    risk_score_sum = Column(Float, nullable=False, default=0)
+    risk_score_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Money, nullable=False, default=0)
+    suspicious_count = Column(Integer, nullable=False, default=0)
+
 class Watchlist(Base):
     __tablename__ = "watchlists"
     
@@ -203,6 +297,11 @@ class Watchlist(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
+    
+    __table_args__ = (
+        # Keyset pagination of the list endpoint: one range scan per page
+        Index('ix_watchlist_active_id', 'is_active', 'id'),
+    )
 
 class TransactionExemption(Base):
     __tablename__ = "transaction_exemptions"
@@ -216,6 +315,10 @@ class TransactionExemption(Base):
     expiry_date = Column(DateTime)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
+    
+    __table_args__ = (
+        Index('ix_exemption_active_id', 'is_active', 'id'),
+    )
 
 class TransactionLimit(Base):
     __tablename__ = "transaction_limits"
@@ -223,8 +326,13 @@ class TransactionLimit(Base):
     id = Column(Integer, primary_key=True, index=True)
     channel = Column(String(50), nullable=False)
     type = Column(String(50), nullable=False)
-    limit = Column(Float, nullable=False)
+    limit = Column(Money, nullable=False)
     flag_reason = Column(Text)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime, onupdate=func.now())
+    
+    __table_args__ = (
+        # One limit per channel/type; the conflict target of the limits upsert
+        Index('uq_limit_channel_type', 'channel', 'type', unique=True),
+    )
\ No newline at end of file
@@ -1,6 +1,12 @@
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, Date, JSON
 from sqlalchemy.sql import func
 from app.db.base import Base
+import enum
+
+class UserRole(str, enum.Enum):
+    ADMIN = "admin"
+    COMPLIANCE = "compliance"
+    ANALYST = "analyst"
 
 class User(Base):
     __tablename__ = "users"
@@ -14,6 +20,7 @@ class User(Base):
     avatar_url = Column(String(255), nullable=True)
     custom_fields = Column(JSON, nullable=True)
     password_expiry = Column(Date, nullable=True)
+    role = Column(String(50), nullable=False, default=UserRole.ANALYST.value, server_default=UserRole.ANALYST.value)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
 
@@ -0,0 +1,105 @@
+from typing import Dict, Any, List, Optional
+from sqlalchemy import insert
+from fastapi.concurrency import run_in_threadpool
+import asyncio
+import logging
+
+from app.db.base import SessionLocal
+from app.models.user import AuditTrail
+
+logger = logging.getLogger(__name__)
+
+class AuditTrailWriter:
+    """Batches audit trail entries and writes them off the request path"""
+
+    def __init__(self, max_batch_size: int = 500, flush_interval: float = 0.1):
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the background consumer on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            self._task.add_done_callback(self._on_consumer_exit)
+
+    def _on_consumer_exit(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Audit trail writer stopped unexpectedly: {task.exception()}")
+
+    async def stop(self):
+        """Flush everything still queued and stop the consumer"""
+        if self._task is None:
+            return
+        if not self._task.done():
+            self._queue.put_nowait(None)
+            await self._task
+        self._task = None
+
+    def enqueue(self, user_id: int, module: str, activity: str, ip_address: str):
+        """
+        Queue an audit trail entry
+
+        Falls back to a direct write when the consumer is not running
+        (e.g. scripts that never went through the app lifespan, or a
+        consumer that died); on an event loop that write runs in the
+        default thread pool so it never blocks the loop.
+        """
+        entry = {
+            'user_id': user_id,
+            'module': module,
+            'activity': activity,
+            'ip_address': ip_address
+        }
+        if self._task is not None and not self._task.done():
+            self._queue.put_nowait(entry)
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write([entry])
+        else:
+            loop.run_in_executor(None, self._write, [entry])
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            entry = await self._queue.get()
+            if entry is None:
+                return
+
+            batch = [entry]
+            stopping = False
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            await run_in_threadpool(self._write, batch)
+            if stopping:
+                return
+
+    def _write(self, batch: List[Dict[str, Any]]):
+        """Insert a batch of entries with a single multi-row INSERT"""
+        db = SessionLocal()
+        try:
+            db.execute(insert(AuditTrail), batch)
+            db.commit()
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} audit trail entries: {str(e)}")
+            db.rollback()
+        finally:
+            db.close()
+
+audit_writer = AuditTrailWriter()
@@ -0,0 +1,82 @@
+from typing import List, Tuple
+from fastapi.concurrency import run_in_threadpool
+from redis.exceptions import RedisError
+import logging
+
+from app.core.cache import get_redis
+from app.db.base import SessionLocal
+from app.models.transaction import Watchlist, TransactionExemption
+
+logger = logging.getLogger(__name__)
+
+# Redis sets of account numbers that may be on the watchlist / exempted. Loading
+# never removes members, so a set can hold stale positives (the DB check settles
+# those) but does not miss an active account.
+WATCHLIST_KEY = "screening:watchlist"
+EXEMPTIONS_KEY = "screening:exemptions"
+READY_KEY = "screening:ready"
+
+LOAD_CHUNK_SIZE = 5000
+
+def _active_accounts(model) -> List[str]:
+    db = SessionLocal()
+    try:
+        return [
+            account_number for (account_number,) in
+            db.query(model.account_number).filter(model.is_active == True)
+        ]
+    finally:
+        db.close()
+
+async def load_screening_sets():
+    """Load every active watchlist and exemption account into Redis"""
+    redis = get_redis()
+    try:
+        for key, model in ((WATCHLIST_KEY, Watchlist), (EXEMPTIONS_KEY, TransactionExemption)):
+            accounts = await run_in_threadpool(_active_accounts, model)
+            for start in range(0, len(accounts), LOAD_CHUNK_SIZE):
+                await redis.sadd(key, *accounts[start:start + LOAD_CHUNK_SIZE])
+        await redis.set(READY_KEY, 1)
+        logger.info("Loaded watchlist and exemption screening sets")
+    except Exception as e:
+        logger.warning(f"Could not load screening sets: {str(e)}")
+
+async def screen_account(account_number: str) -> Tuple[bool, bool]:
+    """
+    Return (maybe_exempted, maybe_watchlisted) for an account. A False is
+    definitive; True means the database has to be checked. Answers True for
+    both whenever Redis is unavailable or the sets were never loaded.
+    """
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            pipe.exists(READY_KEY)
+            pipe.sismember(EXEMPTIONS_KEY, account_number)
+            pipe.sismember(WATCHLIST_KEY, account_number)
+            ready, exempted, watchlisted = await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Screening lookup failed for {account_number}: {str(e)}")
+        return True, True
+
+    if not ready:
+        return True, True
+    return bool(exempted), bool(watchlisted)
+
+async def add_to_screening_set(key: str, account_number: str):
+    """Mirror an activated watchlist/exemption entry into its set"""
+    try:
+        await get_redis().sadd(key, account_number)
+    except RedisError as e:
+        # A missing member would hide the account from screening, so force DB checks
+        logger.error(f"Could not add {account_number} to {key}: {str(e)}")
+        try:
+            await get_redis().delete(READY_KEY)
+        except RedisError:
+            pass
+
+async def remove_from_screening_set(key: str, account_number: str):
+    """Mirror a deactivated watchlist/exemption entry into its set"""
+    try:
+        await get_redis().srem(key, account_number)
+    except RedisError as e:
+        # A stale member only costs a DB lookup
+        logger.warning(f"Could not remove {account_number} from {key}: {str(e)}")
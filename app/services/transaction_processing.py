@@ -1,7 +1,7 @@
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, insert
 import httpx
 import logging
 import json
@@ -16,6 +16,9 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Payload keys that map onto raw_transactions columns
+RAW_TRANSACTION_COLUMNS = frozenset(RawTransaction.__table__.columns.keys()) - {'id', 'created_at', 'updated_at'}
+
 class TransactionProcessingService:
     """Service for processing and monitoring transactions"""
     
@@ -23,13 +26,21 @@ class TransactionProcessingService:
         self.db = db
         self.risk_scoring_service = RiskScoringService()
     
-    def process_transaction(self, transaction_data: Dict[str, Any], case_number: str) -> Dict[str, Any]:
+    def process_transaction(
+        self,
+        transaction_data: Dict[str, Any],
+        case_number: str,
+        check_exemption: bool = True,
+        check_watchlist: bool = True
+    ) -> Dict[str, Any]:
         """
         Main transaction processing method
         
         Args:
             transaction_data: Transaction details
             case_number: Case reference number
+            check_exemption: False when the account is known not to be exempted
+            check_watchlist: False when the account is known not to be watchlisted
             
         Returns:
             Processing result dictionary
@@ -38,7 +49,7 @@ class TransactionProcessingService:
             account_number = transaction_data.get('acct_no')
             
             # Check if transaction is exempted
-            if self.is_transaction_exempted(account_number):
+            if check_exemption and self.is_transaction_exempted(account_number):
                 logger.info(f"Transaction exempted for account: {account_number}")
                 return {
                     'success': True,
@@ -47,7 +58,7 @@ class TransactionProcessingService:
                 }
             
             # Check watchlist
-            watchlist_reason = self.get_watchlist_reason(account_number)
+            watchlist_reason = self.get_watchlist_reason(account_number) if check_watchlist else None
             
             # Evaluate risk
             risk_profile = self.risk_scoring_service.evaluate_risk(transaction_data, case_number)
@@ -56,7 +67,7 @@ class TransactionProcessingService:
             customer_profile = self.process_customer_profiling(transaction_data, case_number, risk_profile)
             
             # Save raw transaction
-            raw_transaction = self.process_raw_transaction(transaction_data, case_number, risk_profile)
+            raw_transaction_id = self.process_raw_transaction(transaction_data, case_number, risk_profile)
             
             # Check transaction thresholds and determine if suspicious
             is_suspicious, flagging_reason = self.check_transaction_thresholds(transaction_data)
@@ -72,7 +83,7 @@ class TransactionProcessingService:
                     transaction_data, 
                     case_number, 
                     flagging_reason or f"High risk score: {risk_profile['risk_score']}",
-                    {'risk_profile': risk_profile}
+                    {'risk_profile': risk_profile, 'is_watchlisted': watchlist_reason is not None}
                 )
                 
                 # Queue for AI analysis if configured
@@ -162,18 +173,21 @@ class TransactionProcessingService:
             self.db.rollback()
             return None
     
-    def process_raw_transaction(self, transaction_data: Dict[str, Any], case_number: str, risk_profile: Dict[str, Any]) -> Optional[RawTransaction]:
-        """Save raw transaction data"""
+    def process_raw_transaction(self, transaction_data: Dict[str, Any], case_number: str, risk_profile: Dict[str, Any]) -> Optional[int]:
+        """Save raw transaction data, returning the new row id"""
         try:
-            raw_transaction = RawTransaction(
+            # Core insert: no ORM instance, identity map entry or flush for a write-only row
+            row = {k: v for k, v in transaction_data.items() if k in RAW_TRANSACTION_COLUMNS}
+            row.update(
                 acct_no=transaction_data['acct_no'],
                 risk_score=risk_profile['risk_score'],
-                risk_level=RiskLevel(risk_profile['risk_level']),
-                **{k: transaction_data.get(k) for k in transaction_data if hasattr(RawTransaction, k) and k != 'acct_no'}
+                risk_level=RiskLevel(risk_profile['risk_level'])
             )
-            self.db.add(raw_transaction)
+            raw_transaction_id = self.db.execute(
+                insert(RawTransaction).values(**row).returning(RawTransaction.id)
+            ).scalar_one()
             self.db.commit()
-            return raw_transaction
+            return raw_transaction_id
             
         except Exception as e:
             logger.error(f"Error saving raw transaction: {str(e)}")
@@ -241,11 +255,14 @@ class TransactionProcessingService:
                 transaction_id=transaction_data.get('tran_id'),
                 currency=transaction_data.get('tran_crncy_code'),
                 transaction_type=transaction_data.get('dr_cr_indicator'),
+                channel=self._determine_channel(transaction_data),
                 amount=float(transaction_data.get('tran_amt', 0)),
                 reference=transaction_data.get('tran_particular'),
                 tpin_number=transaction_data.get('tpin_number'),
                 status=TransactionStatus.SUSPICIOUS,
                 flagging_reason=flagging_reason,
+                risk_score=additional_data.get('risk_profile', {}).get('risk_score'),
+                is_watchlisted=bool(additional_data.get('is_watchlisted')),
                 sanction_category=additional_data.get('sanction_category'),
                 sanction_data=additional_data.get('sanction_data'),
                 watchlist_category=additional_data.get('watchlist_category'),